@@ -2,6 +2,7 @@ from google.adk.agents import LlmAgent
 
 from agents.influencer_search.agent import root_agent as influencer_search_agent
 from agents.marketing_expert.agent import root_agent as marketing_expert_agent
+from agents.utils.router import fast_route_to_agent
 
 root_agent = LlmAgent(
     model="gemini-2.5-flash",
@@ -161,5 +162,6 @@ After receiving a response from any sub-agent:
 
 """,
     sub_agents=[influencer_search_agent, marketing_expert_agent],
+    before_model_callback=fast_route_to_agent,
 )
 
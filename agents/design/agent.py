@@ -4,10 +4,12 @@ from google.adk import Agent
 
 from agents.design.tools.edit_image import edit_image_tool
 from agents.design.tools.create_image import create_image_tool
+from agents.design.tools.create_images import create_images_tool
 from agents.design.tools.list_artifacts import list_artifacts_tool
+from agents.utils.prompts import prompt_registry
 
 instruction_path = Path(__file__).parent / "prompts/design_prompt.md"
-instruction = instruction_path.read_text()
+instruction = prompt_registry.instruction(instruction_path)
 
 
 root_agent = Agent(
@@ -17,6 +19,7 @@ root_agent = Agent(
     tools=[
         list_artifacts_tool,
         create_image_tool,
+        create_images_tool,
         edit_image_tool,
     ],
 )
\ No newline at end of file
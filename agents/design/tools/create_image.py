@@ -1,40 +1,55 @@
-from google import genai
-import os
+import asyncio
+from pathlib import Path
+
 from dotenv import load_dotenv
-from google.adk.tools import  FunctionTool
-from agents.design.utils.artifact_utils import load_prompt, generate_output_path
+from google.adk.tools import  FunctionTool, ToolContext
+from agents.design.utils.artifact_utils import inline_data_bytes, load_prompt, record_produced_artifact, save_image
+from agents.design.utils.genai_client import generate_content
+from agents.utils.tracing import tracer
 
 load_dotenv()
 
 
-def create_image(name: str, design_instructions: str):
-    """
-        Generates a new image for a given asset using design instructions.
-
-        Returns:
-        None: Saves the generated image as a new version under the asset’s artifacts directory.
-    """
-    client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
-
+async def generate_image(name: str, design_instructions: str) -> list[Path]:
+    """Generate an image with the image model and save every returned version."""
     nano_create_prompt = load_prompt("nano_create_prompt.md")
     final_prompt = f"""{nano_create_prompt}
 
     {design_instructions}
     """
 
-    response = client.models.generate_content(
-        model="gemini-2.5-flash-image",
-        contents=[final_prompt],
-    )
-
+    with tracer.span(
+        "generate_content gemini-2.5-flash-image",
+        stage="genai:create_image",
+        **{"gen_ai.request.model": "gemini-2.5-flash-image"},
+    ) as span:
+        response = await generate_content(
+            model="gemini-2.5-flash-image",
+            contents=[final_prompt],
+        )
+        span.attributes["response.bytes"] = inline_data_bytes(response)
+
+    output_paths = []
     for part in response.parts:
         if part.text is not None:
             print(part.text)
         elif part.inline_data is not None:
             image = part.as_image()
-            output_path = generate_output_path(name)
-            print(f" Image will be saved to {output_path}")
-            image.save(str(output_path))
+            output_path = await asyncio.to_thread(save_image, image, name)
+            output_paths.append(output_path)
+
+    return output_paths
+
+
+async def create_image(name: str, design_instructions: str, tool_context: ToolContext):
+    """
+        Generates a new image for a given asset using design instructions.
+
+        Returns:
+        None: Saves the generated image as a new version under the asset’s artifacts directory.
+    """
+    for output_path in await generate_image(name, design_instructions):
+        record_produced_artifact(tool_context, name, output_path)
 
 
 create_image_tool = FunctionTool(func=create_image)
@@ -0,0 +1,122 @@
+import asyncio
+import os
+from typing import Optional
+
+import httpx
+from google.adk.tools import FunctionTool, ToolContext
+from google.genai import errors as genai_errors
+from google.genai import types
+from pydantic import BaseModel
+
+from agents.design.tools.create_image import generate_image
+from agents.design.utils.artifact_utils import record_produced_artifact
+
+BATCH_CONCURRENCY = int(os.getenv("DESIGN_BATCH_CONCURRENCY", "4"))
+BATCH_RETRIES = int(os.getenv("DESIGN_BATCH_RETRIES", "2"))
+BATCH_RETRY_DELAY = float(os.getenv("DESIGN_BATCH_RETRY_DELAY", "1.0"))
+
+
+class ImageSpec(BaseModel):
+    """One image of a batch."""
+
+    name: str
+    design_instructions: str
+
+
+class NoImageReturned(RuntimeError):
+    """The image model answered without an image; asking again may help."""
+
+
+def spec_error(spec) -> Optional[str]:
+    """Why ``spec`` cannot be generated, or None when it is well formed."""
+    if not isinstance(spec, dict):
+        return "Each spec must be an object with name and design_instructions"
+    for field in ("name", "design_instructions"):
+        if not isinstance(spec.get(field), str) or not spec[field].strip():
+            return f"Missing {field}"
+    return None
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether generating the same spec again could succeed.
+
+    Rate limits, server errors, network failures and timeouts are
+    transient; other API errors (bad request, permission) and local I/O
+    errors are not.
+    """
+    if isinstance(error, genai_errors.APIError):
+        return error.code == 429 or error.code >= 500
+    return isinstance(
+        error, (NoImageReturned, httpx.TransportError, asyncio.TimeoutError)
+    )
+
+
+async def create_images(specs: list[ImageSpec], tool_context: ToolContext) -> dict:
+    """
+    Generates several new images concurrently, e.g. one creative per platform of a campaign.
+
+    Args:
+        specs: One entry per image, each with "name" (the asset name, e.g. "launch_instagram")
+            and "design_instructions" (the full design instructions for that image).
+
+    Returns:
+        dict: {"created": {asset name: [versions]}, "failed": [{"name": ..., "error": ...}]}.
+        Images that succeeded are saved even when others fail.
+    """
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def generate_with_retries(spec: dict):
+        for attempt in range(BATCH_RETRIES + 1):
+            try:
+                async with semaphore:
+                    output_paths = await generate_image(spec["name"], spec["design_instructions"])
+                if not output_paths:
+                    raise NoImageReturned("The image model returned no image")
+                return output_paths
+            except Exception as e:
+                if attempt == BATCH_RETRIES or not is_transient(e):
+                    raise
+                await asyncio.sleep(BATCH_RETRY_DELAY * 2 ** attempt)
+
+    # ADK hands the specs over as plain dicts. Malformed ones can never
+    # succeed, so they fail without a model call.
+    valid_specs, failed = [], []
+    for spec in specs:
+        error = spec_error(spec)
+        if error is None:
+            valid_specs.append(spec)
+        else:
+            name = spec.get("name", "") if isinstance(spec, dict) else ""
+            failed.append({"name": name, "error": error})
+
+    results = await asyncio.gather(
+        *(generate_with_retries(spec) for spec in valid_specs),
+        return_exceptions=True,
+    )
+
+    created: dict[str, list[str]] = {}
+    for spec, result in zip(valid_specs, results):
+        name = spec["name"]
+        if isinstance(result, BaseException):
+            failed.append({"name": name, "error": str(result) or type(result).__name__})
+            continue
+        for output_path in result:
+            record_produced_artifact(tool_context, name, output_path)
+            created.setdefault(name, []).append(output_path.stem)
+
+    return {"created": created, "failed": failed}
+
+
+class CreateImagesTool(FunctionTool):
+    """FunctionTool for ``create_images`` that marks every spec field required."""
+
+    def _get_declaration(self) -> types.FunctionDeclaration:
+        declaration = super()._get_declaration()
+        # ADK lists a model's fields as properties but not which are required.
+        declaration.parameters.properties["specs"].items.required = list(
+            ImageSpec.model_fields
+        )
+        return declaration
+
+
+create_images_tool = CreateImagesTool(func=create_images)
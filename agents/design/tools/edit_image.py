@@ -1,52 +1,65 @@
-from pathlib import Path
+import asyncio
+import io
 
-from google import genai
-import os
 from dotenv import load_dotenv
 from PIL import Image
-from google.adk.tools import  FunctionTool
+from google.adk.tools import  FunctionTool, ToolContext
+from google.genai import types
 
-from agents.design.utils.artifact_utils import generate_output_path, get_latest_image, load_prompt
+from agents.design.utils.artifact_utils import (
+    inline_data_bytes,
+    load_latest_image,
+    load_prompt,
+    record_produced_artifact,
+    save_image,
+)
+from agents.design.utils.genai_client import generate_content
+from agents.utils.tracing import tracer
 
 load_dotenv()
 
-def edit_image(name: str, design_instructions: str):
+def load_base_image(name: str) -> types.Part:
+    """The latest version as-is, sniffing its format without decoding pixels."""
+    data = load_latest_image(name)
+    with Image.open(io.BytesIO(data)) as image:
+        mime_type = Image.MIME[image.format]
+    return types.Part.from_bytes(data=data, mime_type=mime_type)
+
+async def edit_image(name: str, design_instructions: str, tool_context: ToolContext):
     """
     Edits the latest image for an existing asset using design instructions.
 
     Returns:
         None: Saves the edited image as a new version under the asset’s artifacts directory.
     """
-    project_root = Path(__file__).resolve().parent.parent
-    asset_dir = project_root / "artifacts" / name
-
-    latest_image_path = get_latest_image(asset_dir)
-    base_image = Image.open(latest_image_path)
-
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        raise RuntimeError("GOOGLE_API_KEY not found")
-
-    client = genai.Client(api_key=api_key)
+    base_image = await asyncio.to_thread(load_base_image, name)
 
     nano_edit_prompt = load_prompt("nano_edit_prompt.md")
     final_prompt = f"{nano_edit_prompt}\n{design_instructions}"
 
-    response = client.models.generate_content(
-        model="gemini-2.5-flash-image",
-        contents=[
-            base_image,
-            final_prompt
-        ],
-    )
+    with tracer.span(
+        "generate_content gemini-2.5-flash-image",
+        stage="genai:edit_image",
+        **{
+            "gen_ai.request.model": "gemini-2.5-flash-image",
+            "request.bytes": len(base_image.inline_data.data),
+        },
+    ) as span:
+        response = await generate_content(
+            model="gemini-2.5-flash-image",
+            contents=[
+                base_image,
+                final_prompt
+            ],
+        )
+        span.attributes["response.bytes"] = inline_data_bytes(response)
 
     for part in response.candidates[0].content.parts:
         if part.inline_data:
             image = part.as_image()
-            output_path = generate_output_path(name)
-            image.save(str(output_path))
-            print(f" Image saved to {output_path}")
+            output_path = await asyncio.to_thread(save_image, image, name)
+            record_produced_artifact(tool_context, name, output_path)
 
 edit_image_tool  = FunctionTool(
     func=edit_image,
-)
\ No newline at end of file
+)
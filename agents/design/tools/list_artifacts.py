@@ -1,6 +1,7 @@
-from pathlib import Path
 from google.adk.tools import FunctionTool
 
+from agents.design.utils.artifact_index import artifact_index
+
 def list_artifacts() -> dict:
     """
     Lists existing creative artifacts and their available versions.
@@ -9,29 +10,9 @@ def list_artifacts() -> dict:
         dict: A mapping of asset names to version identifiers (e.g. {"login_screen": ["v1", "v2"]}). Returns an empty dictionary if no artifacts are found.
     """
 
-    project_root = Path(__file__).resolve().parent.parent
-    artifacts_dir = project_root / "artifacts"
-
-    if not artifacts_dir.exists():
-        return {}
-
-    summary: dict[str, list[str]] = {}
-
-    for asset_dir in artifacts_dir.iterdir():
-        if not asset_dir.is_dir():
-            continue
-
-        versions = []
-        for file in asset_dir.glob("v*.png"):
-            stem = file.stem
-            if stem[1:].isdigit():
-                versions.append(stem)
-
-        if versions:
-            summary[asset_dir.name] = sorted(
-                versions, key=lambda v: int(v[1:])
-            )
-
-    return summary
+    return {
+        name: [f"v{version}" for version in artifact_index.versions(name)]
+        for name in artifact_index.names()
+    }
 
 list_artifacts_tool = FunctionTool(func=list_artifacts)
@@ -0,0 +1,96 @@
+"""Prune old artifact versions and the blobs nothing refers to any more.
+
+A version is kept when it is the latest of its asset, one of the newest
+``--keep-versions`` of it, or younger than ``--max-age-days``; every other
+version loses its file, its renditions and its index entry. Blobs that no
+remaining version uses are then deleted (see ``BlobStore.collect_garbage``).
+Pass 0 to disable either retention rule.
+
+Usage:
+    python -m agents.design.utils.artifact_gc [--keep-versions 10]
+        [--max-age-days 30] [--dry-run]
+"""
+import argparse
+import json
+import os
+import time
+
+from agents.design.utils.artifact_index import artifact_index
+from agents.design.utils.blob_store import blob_store
+from agents.design.utils.renditions import RENDITION_SIZES, rendition_path
+
+ARTIFACT_KEEP_VERSIONS = int(os.getenv("ARTIFACT_KEEP_VERSIONS", "10"))
+ARTIFACT_MAX_AGE_DAYS = float(os.getenv("ARTIFACT_MAX_AGE_DAYS", "30"))
+
+
+def expired_versions(keep_versions: int, max_age_days: float) -> dict[str, list[int]]:
+    """Versions of each asset that fall outside the retention policy."""
+    if not keep_versions and not max_age_days:
+        return {}
+
+    cutoff = time.time() - max_age_days * 86400 if max_age_days else float("inf")
+    expired = {}
+    for name in artifact_index.names():
+        versions = artifact_index.versions(name)
+        kept = set(versions[-max(keep_versions, 1):]) if keep_versions else {versions[-1]}
+        old = [
+            version for version in versions
+            if version not in kept
+            and artifact_index.get_entry(name, version)["created_at"] < cutoff
+        ]
+        if old:
+            expired[name] = old
+    return expired
+
+
+def prune_versions(expired: dict[str, list[int]]):
+    for name, versions in expired.items():
+        artifact_index.remove(name, versions)
+        for version in versions:
+            source = artifact_index.artifacts_dir / name / f"v{version}.png"
+            for size in RENDITION_SIZES:
+                rendition_path(source, size).unlink(missing_ok=True)
+            source.unlink(missing_ok=True)
+
+
+def collect_garbage(
+    keep_versions: int = ARTIFACT_KEEP_VERSIONS,
+    max_age_days: float = ARTIFACT_MAX_AGE_DAYS,
+    dry_run: bool = False,
+) -> dict:
+    expired = expired_versions(keep_versions, max_age_days)
+    if not dry_run:
+        prune_versions(expired)
+
+    pruned = {(name, version) for name, versions in expired.items() for version in versions}
+    referenced = {
+        entry["sha256"]
+        for entry in artifact_index.entries()
+        if "sha256" in entry and (entry["name"], entry["version"]) not in pruned
+    }
+    # A dry run leaves the pruned versions' files, and so their links to
+    # blobs, in place; they are discounted the same way in both modes.
+    released = [
+        artifact_index.artifacts_dir / name / f"v{version}.png" for name, version in pruned
+    ]
+    return {
+        "pruned_versions": len(pruned),
+        **blob_store.collect_garbage(referenced, released, dry_run=dry_run),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--keep-versions", type=int, default=ARTIFACT_KEEP_VERSIONS,
+                        help="newest versions to keep per asset")
+    parser.add_argument("--max-age-days", type=float, default=ARTIFACT_MAX_AGE_DAYS,
+                        help="keep every version younger than this")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report what would be pruned without deleting anything")
+    args = parser.parse_args()
+
+    print(json.dumps(collect_garbage(args.keep_versions, args.max_age_days, args.dry_run)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+project_root = Path(__file__).resolve().parent.parent
+
+ARTIFACTS_DIR = Path(os.getenv("DESIGN_ARTIFACTS_DIR", project_root / "artifacts"))
+
+MANIFEST_NAME = "index.jsonl"
+
+
+class ArtifactIndex:
+    """Catalog of design artifacts, kept in memory and in an append-only manifest.
+
+    Every saved version is appended as one JSON line to ``index.jsonl`` in the
+    artifacts directory, and so is every version removal (as a ``deleted``
+    entry), so the manifest is never rewritten. The in-memory view is rebuilt from that manifest at
+    startup (or from a one-off directory scan when no manifest exists yet) and
+    is refreshed incrementally by reading only the lines other processes have
+    appended since the last read, so lookups never walk the artifact tree.
+    """
+
+    def __init__(self, artifacts_dir: Path):
+        self.artifacts_dir = artifacts_dir
+        self.manifest_path = artifacts_dir / MANIFEST_NAME
+        self._change_counter = 0
+        self._assets: dict[str, dict[int, dict]] = {}
+        self._latest: dict[str, int] = {}
+        self._updated: dict[str, int] = {}
+        self._offset = 0
+        self._lock = threading.RLock()
+        self._loaded = False
+
+    def record(self, name: str, version: int, **metadata):
+        """Register a newly written version and append it to the manifest."""
+        entry = {
+            "name": name,
+            "version": version,
+            "created_at": time.time(),
+            **metadata,
+        }
+        with self._lock:
+            self._refresh()
+            self._write_entries([entry])
+            self._refresh()
+
+    def remove(self, name: str, versions: list[int]):
+        """Drop ``versions`` of ``name`` from the catalog.
+
+        Only the index changes; deleting the files is up to the caller.
+        """
+        now = time.time()
+        entries = [
+            {"name": name, "version": version, "deleted": True, "created_at": now}
+            for version in versions
+        ]
+        with self._lock:
+            self._refresh()
+            self._write_entries(entries)
+            self._refresh()
+
+    def entries(self) -> list[dict]:
+        """Entries of every live version, oldest first."""
+        with self._lock:
+            self._refresh()
+            return sorted(
+                (entry for versions in self._assets.values() for entry in versions.values()),
+                key=lambda entry: entry["created_at"],
+            )
+
+    def allocate(self, name: str) -> Path:
+        """Reserve the next free ``vN.png`` path for ``name``.
+
+        The file is created with O_EXCL, so concurrent callers in this or any
+        other process can never be handed the same version.
+        """
+        asset_dir = self.artifacts_dir / name
+        asset_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._refresh()
+            version = self._latest.get(name, 0) + 1
+            while True:
+                path = asset_dir / f"v{version}.png"
+                try:
+                    os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+                    return path
+                except FileExistsError:
+                    version += 1
+
+    def latest_version(self, name: str) -> Optional[int]:
+        with self._lock:
+            self._refresh()
+            return self._latest.get(name)
+
+    def versions(self, name: str) -> list[int]:
+        with self._lock:
+            self._refresh()
+            return sorted(self._assets.get(name, {}))
+
+    def get_entry(self, name: str, version: int) -> Optional[dict]:
+        with self._lock:
+            self._refresh()
+            return self._assets.get(name, {}).get(version)
+
+    def names(self) -> list[str]:
+        with self._lock:
+            self._refresh()
+            return sorted(self._assets)
+
+    @property
+    def change_counter(self) -> int:
+        """Grows by one for every recorded or removed version; usable as a change cursor."""
+        with self._lock:
+            self._refresh()
+            return self._change_counter
+
+    def changed_since(self, cursor: int = 0) -> list[str]:
+        """Names of assets that gained or lost versions after ``cursor``, most recent first."""
+        with self._lock:
+            self._refresh()
+            return sorted(
+                (name for name, updated in self._updated.items() if updated > cursor),
+                key=self._updated.get,
+                reverse=True,
+            )
+
+    def _refresh(self):
+        if not self._loaded:
+            self._loaded = True
+            if not self.manifest_path.exists():
+                self._write_entries(self._scan())
+
+        try:
+            size = self.manifest_path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size == self._offset:
+            return
+
+        with open(self.manifest_path, "rb") as manifest:
+            manifest.seek(self._offset)
+            chunk = manifest.read()
+
+        complete, newline, _ = chunk.rpartition(b"\n")
+        if not newline:
+            return
+        self._offset += len(complete) + 1
+
+        for line in complete.splitlines():
+            if line.strip():
+                self._apply(json.loads(line))
+
+    def _apply(self, entry: dict):
+        name = entry["name"]
+        version = int(entry["version"])
+        self._change_counter += 1
+        self._updated[name] = self._change_counter
+        if not entry.get("deleted"):
+            self._assets.setdefault(name, {})[version] = entry
+            self._latest[name] = max(version, self._latest.get(name, 0))
+            return
+
+        versions = self._assets.get(name, {})
+        versions.pop(version, None)
+        if versions:
+            self._latest[name] = max(versions)
+        else:
+            self._assets.pop(name, None)
+            self._latest.pop(name, None)
+            self._updated.pop(name, None)
+
+    def _write_entries(self, entries: list[dict]):
+        if not entries:
+            return
+        self.artifacts_dir.mkdir(parents=True, exist_ok=True)
+        payload = "".join(json.dumps(entry) + "\n" for entry in entries)
+        fd = os.open(self.manifest_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, payload.encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def _scan(self) -> list[dict]:
+        if not self.artifacts_dir.exists():
+            return []
+
+        entries = []
+        for asset_dir in self.artifacts_dir.iterdir():
+            if not asset_dir.is_dir():
+                continue
+            for version_file in asset_dir.glob("v*.png"):
+                if version_file.stem[1:].isdigit() and version_file.stat().st_size:
+                    entries.append({
+                        "name": asset_dir.name,
+                        "version": int(version_file.stem[1:]),
+                        "created_at": version_file.stat().st_mtime,
+                    })
+        entries.sort(key=lambda entry: entry["created_at"])
+        return entries
+
+
+artifact_index = ArtifactIndex(ARTIFACTS_DIR)
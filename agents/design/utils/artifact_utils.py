@@ -1,32 +1,170 @@
+import contextvars
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Optional
+
+from agents.design.utils.artifact_index import artifact_index
+from agents.design.utils.blob_store import blob_store
+from agents.design.utils.renditions import schedule_renditions
+from agents.utils.cache import BytesLRUCache
+from agents.utils.prompts import prompt_registry
+from agents.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
 
 project_root = Path(__file__).resolve().parent.parent
 
+PRODUCED_ARTIFACTS_KEY = "produced_artifacts"
+
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+IMAGE_WRITE_WORKERS = int(os.getenv("IMAGE_WRITE_WORKERS", "2"))
+
+# Bytes of recently saved and edited versions, keyed "name/vN.png".
+image_cache = BytesLRUCache(IMAGE_CACHE_MAX_BYTES)
+
+_writer = ThreadPoolExecutor(max_workers=IMAGE_WRITE_WORKERS, thread_name_prefix="image-writer")
+_pending_lock = threading.Lock()
+_pending_writes: dict[str, tuple[str, int, Future]] = {}
+
+for prompt_path in (project_root / "prompts").glob("*.md"):
+    prompt_registry.get(prompt_path)
+
 def load_prompt(name: str) -> str:
-    prompt_path = project_root / "prompts" / name
-    print(prompt_path)
-    return prompt_path.read_text(encoding="utf-8")
+    return prompt_registry.get(project_root / "prompts" / name)
 
 def generate_output_path(name: str) -> Path:
-    asset_dir = project_root / "artifacts" / name
-    asset_dir.mkdir(parents=True, exist_ok=True)
-
-    versions = [
-        int(p.stem[1:]) for p in asset_dir.glob("v*.png")
-        if p.stem[1:].isdigit()
-    ]
-    next_version = max(versions, default=0) + 1
-
-    return asset_dir / f"v{next_version}.png"
-
-def get_latest_image(asset_dir: Path) -> Path:
-    versions = [
-        int(p.stem[1:]) for p in asset_dir.glob("v*.png")
-        if p.stem[1:].isdigit()
-    ]
-    if not versions:
-        raise RuntimeError("No existing versions found")
+    return artifact_index.allocate(name)
+
+def save_image(image, name: str) -> Path:
+    """Store a new version of ``name`` and return its (future) path.
+
+    The bytes go into ``image_cache`` right away, so the version can be
+    served and edited before the file exists; the durable copy is written
+    on a background thread, which records the version in the index once
+    the file is complete. A version whose write fails is never recorded,
+    and its number is not reused.
+    """
+    with tracer.span("save_image", stage="artifact:save", **{"artifact.name": name}) as span:
+        output_path = generate_output_path(name)
+        version = int(output_path.stem[1:])
+        key = artifact_key(name, version)
+        data = image.image_bytes
+        span.attributes["response.bytes"] = len(data)
+
+        image_cache.set(key, data)
+        with _pending_lock:
+            # The write span belongs to the tool call that saved the image.
+            future = _writer.submit(
+                contextvars.copy_context().run, _write_version, output_path, data
+            )
+            _pending_writes[key] = (name, version, future)
+        future.add_done_callback(lambda _: _forget_write(key))
+    return output_path
+
+def _write_version(output_path: Path, data: bytes):
+    name, version = output_path.parent.name, int(output_path.stem[1:])
+    try:
+        with tracer.span("write_image", stage="artifact:write", **{"artifact.name": name}):
+            digest = blob_store.store(data, output_path)
+            artifact_index.record(name, version, sha256=digest, size=len(data))
+    except Exception:
+        logger.exception("Could not write %s", output_path)
+        # The reserved file stays behind so the version number is never
+        # handed out again: its cached bytes may already have been served
+        # as immutable. Unrecorded, the version itself is never served.
+        image_cache.discard(artifact_key(name, version))
+        raise
+    logger.debug("Image saved to %s", output_path)
+    schedule_renditions(output_path)
+
+def _forget_write(key: str):
+    with _pending_lock:
+        _pending_writes.pop(key, None)
 
-    return asset_dir / f"v{max(versions)}.png"
+def wait_for_image_writes(timeout: Optional[float] = None):
+    """Block until every version saved so far is on disk and indexed."""
+    with _pending_lock:
+        futures = [future for _, _, future in _pending_writes.values()]
+    wait(futures, timeout=timeout)
 
+def pending_image_writes() -> int:
+    with _pending_lock:
+        return len(_pending_writes)
+
+def record_produced_artifact(tool_context, name: str, output_path: Path):
+    """Attribute a saved version to the current turn via the session state delta.
+
+    All versions of a turn share one state key, which every turn starts
+    empty (see ``services.chat.stream_agent``), so session state only ever
+    holds the latest turn's images. AgentTool forwards state deltas to the
+    calling agent, so the key surfaces on the events of the top-level run;
+    parallel tool calls' entries are deep-merged into one event.
+    """
+    version = int(output_path.stem[1:])
+    produced = dict(tool_context.state.get(PRODUCED_ARTIFACTS_KEY) or {})
+    produced[f"{name}:v{version}"] = {"name": name, "version": version}
+    tool_context.state[PRODUCED_ARTIFACTS_KEY] = produced
+
+def inline_data_bytes(response) -> int:
+    """Size of the inline image data in a generate_content response."""
+    return sum(
+        len(part.inline_data.data)
+        for part in response.parts or []
+        if part.inline_data and part.inline_data.data
+    )
+
+def artifact_key(name: str, version: int) -> str:
+    return f"{name}/v{version}.png"
+
+def latest_image_version(name: str) -> Optional[int]:
+    """Newest version of ``name``, including saves still being written."""
+    with _pending_lock:
+        pending = [v for n, v, _ in _pending_writes.values() if n == name]
+    indexed = artifact_index.latest_version(name)
+    versions = pending + ([indexed] if indexed is not None else [])
+    return max(versions) if versions else None
+
+def read_image_bytes(name: str, version: int) -> Optional[bytes]:
+    """Bytes of a saved version, from memory when it was used recently.
+
+    Returns None when the version was never saved.
+    """
+    key = artifact_key(name, version)
+    data = image_cache.get(key)
+    if data is not None:
+        return data
+
+    with _pending_lock:
+        pending = _pending_writes.get(key)
+    if pending is not None:
+        pending[2].result()
+    elif artifact_index.get_entry(name, version) is None:
+        return None
+
+    data = (artifact_index.artifacts_dir / key).read_bytes()
+    image_cache.set(key, data)
+    return data
+
+def wait_for_image_write(filename: str):
+    """Wait until the version file ``filename`` (e.g. ``banner/v2.png``) is on disk."""
+    with _pending_lock:
+        pending = _pending_writes.get(filename)
+    if pending is not None:
+        wait([pending[2]])
+
+def cached_image_bytes(filename: str) -> Optional[bytes]:
+    """Bytes of the version file ``filename`` if they are held in memory."""
+    data = image_cache.get(filename)
+    if data is None:
+        wait_for_image_write(filename)
+    return data
+
+def load_latest_image(name: str) -> bytes:
+    latest_version = latest_image_version(name)
+    if latest_version is None:
+        raise RuntimeError("No existing versions found")
 
+    return read_image_bytes(name, latest_version)
@@ -0,0 +1,125 @@
+import hashlib
+import logging
+import os
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Iterable
+
+from agents.design.utils.artifact_index import ARTIFACTS_DIR
+
+logger = logging.getLogger(__name__)
+
+BLOB_DIR_NAME = ".blobs"
+BLOB_GC_GRACE_SECONDS = float(os.getenv("BLOB_GC_GRACE_SECONDS", "3600"))
+
+
+class BlobStore:
+    """Content-addressed image storage shared by all artifact versions.
+
+    Every distinct image is stored once as ``<root>/<ab>/<sha256>``; a
+    version file (``name/vN.png``) is a hard link to its blob, so identical
+    outputs take no extra disk while every existing path keeps working.
+    On filesystems without hard links deduplication is switched off after
+    the first failed link, and version files are plain copies with no blob.
+    """
+
+    def __init__(self, root: Path, grace_period: float = BLOB_GC_GRACE_SECONDS):
+        self.root = root
+        self.grace_period = grace_period
+        self.hard_links = True
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def store(self, data: bytes, target: Path) -> str:
+        """Make ``target`` hold ``data``, sharing the blob of identical content.
+
+        ``target`` is replaced atomically. Returns the content's SHA-256.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        temp_path = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            if not (self.hard_links and self._link(digest, data, temp_path)):
+                temp_path.write_bytes(data)
+            os.replace(temp_path, target)
+        finally:
+            temp_path.unlink(missing_ok=True)
+        return digest
+
+    def collect_garbage(
+        self, referenced: set[str], released: Iterable[Path] = (), dry_run: bool = False
+    ) -> dict:
+        """Delete blobs no version refers to any more.
+
+        A blob is kept while it is in ``referenced``, still hard-linked from
+        a version file other than those in ``released`` (versions being
+        pruned, which a dry run leaves in place), or younger than the grace
+        period (it may belong to a save that is not yet recorded in the
+        index).
+        """
+        released_links: Counter = Counter()
+        for path in released:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            released_links[stat.st_dev, stat.st_ino] += 1
+
+        removed = freed = 0
+        cutoff = time.time() - self.grace_period
+        for blob in self.root.glob("*/*"):
+            if blob.name.startswith(".") or blob.name in referenced:
+                continue
+            stat = blob.stat()
+            links = stat.st_nlink - released_links[stat.st_dev, stat.st_ino]
+            if links > 1 or stat.st_mtime > cutoff:
+                continue
+            if not dry_run:
+                blob.unlink(missing_ok=True)
+            removed += 1
+            freed += stat.st_size
+        return {"removed_blobs": removed, "freed_bytes": freed}
+
+    def _link(self, digest: str, data: bytes, link_path: Path, retry: bool = True) -> bool:
+        """Hard-link the blob of ``data`` to ``link_path``.
+
+        Returns False, and switches deduplication off, when the filesystem
+        does not support hard links.
+        """
+        blob = self.path(digest)
+        created = False
+        if blob.exists():
+            # Refresh the mtime so a concurrent collection leaves it alone.
+            os.utime(blob)
+        else:
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            temp_blob = blob.with_name(f".{digest}.{uuid.uuid4().hex}.tmp")
+            try:
+                temp_blob.write_bytes(data)
+                os.replace(temp_blob, blob)
+            finally:
+                temp_blob.unlink(missing_ok=True)
+            created = True
+        try:
+            os.link(blob, link_path)
+        except FileNotFoundError:
+            if not retry:
+                raise
+            # Collected between the existence check and the link.
+            return self._link(digest, data, link_path, retry=False)
+        except OSError as e:
+            logger.warning(
+                "Cannot hard-link blobs in %s (%s); storing artifact versions "
+                "as plain copies without deduplication", self.root, e,
+            )
+            self.hard_links = False
+            if created:
+                # Versions would only ever be copies, so the blob is dead weight.
+                blob.unlink(missing_ok=True)
+            return False
+        return True
+
+
+blob_store = BlobStore(ARTIFACTS_DIR / BLOB_DIR_NAME)
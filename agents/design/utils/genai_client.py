@@ -0,0 +1,90 @@
+import asyncio
+import atexit
+import os
+import threading
+from typing import Optional
+
+import httpx
+from google import genai
+from google.genai import types
+
+GENAI_MAX_CONNECTIONS = int(os.getenv("GENAI_MAX_CONNECTIONS", "20"))
+GENAI_KEEPALIVE_EXPIRY = float(os.getenv("GENAI_KEEPALIVE_EXPIRY", "60"))
+
+_lock = threading.Lock()
+_client: Optional[genai.Client] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_client() -> genai.Client:
+    """Return the process-wide genai client with keep-alive HTTP connections.
+
+    Its async connections belong to the client loop, so async calls go
+    through ``generate_content`` rather than ``client.aio`` directly.
+    """
+    global _client
+    with _lock:
+        if _client is None:
+            _client = _create_client()
+        return _client
+
+
+async def generate_content(**kwargs) -> types.GenerateContentResponse:
+    """``client.aio.models.generate_content`` on the shared client loop.
+
+    Async HTTP connections cannot outlive the event loop that opened them,
+    and Flask runs every async view on a loop of its own. Running every
+    call on one long-lived loop lets requests from any loop (Flask's,
+    uvicorn's, a worker thread's) share the same connection pool.
+    """
+    coro = get_client().aio.models.generate_content(**kwargs)
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, _ensure_loop()))
+
+
+def close_client():
+    """Close the shared client's connections and stop its loop."""
+    global _client, _loop
+    with _lock:
+        client, _client = _client, None
+        loop, _loop = _loop, None
+    if client is not None:
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(client.aio.aclose(), loop).result()
+        client.close()
+    if loop is not None:
+        loop.call_soon_threadsafe(loop.stop)
+
+
+def _ensure_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="genai-client", daemon=True
+            ).start()
+        return _loop
+
+
+def _create_client() -> genai.Client:
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        raise RuntimeError("GOOGLE_API_KEY not found")
+
+    limits = httpx.Limits(
+        max_connections=GENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=GENAI_MAX_CONNECTIONS,
+        keepalive_expiry=GENAI_KEEPALIVE_EXPIRY,
+    )
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(
+            client_args={"limits": limits},
+            # Passing a transport keeps genai on httpx (instead of aiohttp)
+            # so the same connection limits apply to async calls.
+            async_client_args={"transport": httpx.AsyncHTTPTransport(limits=limits)},
+        ),
+    )
+
+
+atexit.register(close_client)
@@ -0,0 +1,128 @@
+import logging
+import os
+import re
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image
+
+from agents.design.utils.artifact_index import artifact_index
+
+logger = logging.getLogger(__name__)
+
+# Longest edge in pixels for each rendition served via ``?size=``.
+RENDITION_SIZES = {
+    "thumb": int(os.getenv("RENDITION_THUMB_SIZE", "256")),
+    "preview": int(os.getenv("RENDITION_PREVIEW_SIZE", "768")),
+}
+RENDITION_QUALITY = int(os.getenv("RENDITION_WEBP_QUALITY", "80"))
+RENDITION_WORKERS = int(os.getenv("RENDITION_WORKERS", "2"))
+
+_VERSION_FILE = re.compile(r"(?P<name>[^/]+)/v(?P<version>\d+)\.png")
+_RENDITION_FILE = re.compile(r"(?P<name>[^/]+)/v(?P<version>\d+)\.(?P<size>\w+)\.webp")
+
+_executor = ThreadPoolExecutor(max_workers=RENDITION_WORKERS, thread_name_prefix="rendition")
+_pending_lock = threading.Lock()
+_pending: set[Future] = set()
+
+
+def rendition_path(source: Path, size: str) -> Path:
+    """``name/vN.png`` -> ``name/vN.<size>.webp``."""
+    return source.with_name(f"{source.stem}.{size}.webp")
+
+
+def create_renditions(source: Path):
+    """Write a downscaled WebP copy of ``source`` for every rendition size."""
+    with Image.open(source) as image:
+        image.load()
+        for size, edge in RENDITION_SIZES.items():
+            rendition = image.copy()
+            rendition.thumbnail((edge, edge))
+            if rendition.mode not in ("RGB", "RGBA"):
+                rendition = rendition.convert("RGBA")
+
+            target = rendition_path(source, size)
+            temp_path = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+            try:
+                rendition.save(temp_path, "WEBP", quality=RENDITION_QUALITY, method=4)
+                os.replace(temp_path, target)
+            finally:
+                temp_path.unlink(missing_ok=True)
+
+
+def schedule_renditions(source: Path):
+    """Create the renditions of a newly saved version on a background thread."""
+    future = _executor.submit(_create_renditions_quietly, source)
+    with _pending_lock:
+        _pending.add(future)
+    future.add_done_callback(_forget_rendition)
+
+
+def _forget_rendition(future: Future):
+    with _pending_lock:
+        _pending.discard(future)
+
+
+def wait_for_renditions(timeout: Optional[float] = None):
+    """Block until every rendition scheduled so far has been attempted."""
+    with _pending_lock:
+        futures = list(_pending)
+    wait(futures, timeout=timeout)
+
+
+def _create_renditions_quietly(source: Path):
+    try:
+        create_renditions(source)
+    except Exception as e:
+        logger.warning("Could not create renditions for %s: %s", source, e)
+
+
+def is_immutable(filename: str) -> bool:
+    """Whether ``filename`` is a finished version file or rendition.
+
+    Both are written once under their final name (via rename) and never
+    change afterwards; a version only counts once it has been recorded,
+    since its path is reserved empty before the image is written.
+    """
+    match = _VERSION_FILE.fullmatch(filename)
+    if match is not None:
+        return artifact_index.get_entry(match["name"], int(match["version"])) is not None
+    match = _RENDITION_FILE.fullmatch(filename)
+    return match is not None and match["size"] in RENDITION_SIZES
+
+
+def is_unfinished_version(filename: str) -> bool:
+    """Whether ``filename`` is a version file whose image is not written yet.
+
+    A version's path is reserved as an empty file and the version is only
+    recorded once its bytes are in place, so until then it must not be
+    served.
+    """
+    match = _VERSION_FILE.fullmatch(filename)
+    if match is None:
+        return False
+    return artifact_index.get_entry(match["name"], int(match["version"])) is None
+
+
+def find_rendition(filename: str, size: str) -> Optional[str]:
+    """Artifacts-relative path of the ``size`` rendition of ``filename``.
+
+    ``filename`` is a version file such as ``banner/v2.png``. Versions saved
+    before renditions existed get theirs created on first request. Returns
+    None when ``filename`` is not a known artifact version.
+    """
+    match = _VERSION_FILE.fullmatch(filename)
+    if match is None:
+        return None
+    name, version = match["name"], int(match["version"])
+    if artifact_index.get_entry(name, version) is None:
+        return None
+
+    source = artifact_index.artifacts_dir / name / f"v{version}.png"
+    target = rendition_path(source, size)
+    if not target.exists():
+        create_renditions(source)
+    return f"{name}/{target.name}"
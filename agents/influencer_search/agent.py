@@ -3,22 +3,44 @@ from pathlib import Path
 
 from google.adk.agents.llm_agent import Agent
 from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPServerParams
-from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
+
+from agents.influencer_search.mcp_pool import PooledMcpToolset, create_keepalive_http_client
+from agents.utils.cache import TTLCache
+from agents.utils.prompts import prompt_registry
 
 instruction_path = Path(__file__).parent / "influencer_search_prompt.md"
-instruction = instruction_path.read_text()
+instruction = prompt_registry.instruction(instruction_path)
 
 firecrawl_api_key = os.getenv("FIRECRAWL_API_KEY")
+firecrawl_mcp_url = os.getenv(
+    "FIRECRAWL_MCP_URL", f"https://mcp.firecrawl.dev/{firecrawl_api_key}/v2/mcp"
+)
+
+cache_path = os.getenv("INFLUENCER_CACHE_PATH")
+search_result_cache = TTLCache(
+    ttl=float(os.getenv("INFLUENCER_CACHE_TTL", "3600")),
+    max_size=int(os.getenv("INFLUENCER_CACHE_SIZE", "512")),
+    path=Path(cache_path) if cache_path else None,
+)
+# Read-only Firecrawl tools; crawl jobs and their status checks must not be
+# replayed from the cache.
+CACHEABLE_TOOLS = ("firecrawl_search", "firecrawl_scrape", "firecrawl_map")
+# Free-text arguments, matched ignoring case and whitespace.
+CACHE_TEXT_FIELDS = ("query", "search")
 
 root_agent = Agent(
     model="gemini-2.5-flash",
     name="influencer_search_agent",
     instruction=instruction,
     tools=[
-        McpToolset(
+        PooledMcpToolset(
             connection_params=StreamableHTTPServerParams(
-                url=f"https://mcp.firecrawl.dev/{firecrawl_api_key}/v2/mcp",
+                url=firecrawl_mcp_url,
+                httpx_client_factory=create_keepalive_http_client,
             ),
+            result_cache=search_result_cache,
+            cacheable_tools=CACHEABLE_TOOLS,
+            cache_text_fields=CACHE_TEXT_FIELDS,
         )
     ],
-)
\ No newline at end of file
+)
@@ -0,0 +1,327 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from contextlib import AsyncExitStack
+from datetime import timedelta
+from typing import Collection, Optional
+
+import httpx
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.mcp_tool.mcp_session_manager import (
+    MCPSessionManager,
+    StdioConnectionParams,
+)
+from google.adk.tools.mcp_tool.mcp_tool import MCPTool
+from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
+from mcp import ClientSession
+
+from agents.utils.cache import TTLCache, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+MCP_MAX_CONNECTIONS = int(os.getenv("MCP_MAX_CONNECTIONS", "10"))
+MCP_KEEPALIVE_EXPIRY = float(os.getenv("MCP_KEEPALIVE_EXPIRY", "120"))
+MCP_TOOL_CACHE_TTL = float(os.getenv("MCP_TOOL_CACHE_TTL", "600"))
+MCP_HEALTH_CHECK_INTERVAL = float(os.getenv("MCP_HEALTH_CHECK_INTERVAL", "60"))
+
+
+def create_keepalive_http_client(
+    headers: Optional[dict[str, str]] = None,
+    timeout: Optional[httpx.Timeout] = None,
+    auth: Optional[httpx.Auth] = None,
+) -> httpx.AsyncClient:
+    """HTTP client factory for MCP connections that keeps sockets warm."""
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=timeout or httpx.Timeout(30.0, read=300.0),
+        auth=auth,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=MCP_MAX_CONNECTIONS,
+            max_keepalive_connections=MCP_MAX_CONNECTIONS,
+            keepalive_expiry=MCP_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+class PooledMcpSessionManager(MCPSessionManager):
+    """MCPSessionManager that opens and closes each session in one task.
+
+    The MCP transports hold anyio task groups, which must be exited by the
+    task that entered them. ADK's manager enters them in whichever task
+    first asks for the session and exits them from ``close``, so closing
+    fails with "Attempted to exit cancel scope in a different task". Here
+    each session is held by an owner task that opens it, waits until it is
+    told to close, and then closes it itself.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sessions: dict[str, tuple[ClientSession, asyncio.Event, asyncio.Task]] = {}
+
+    async def create_session(
+        self, headers: Optional[dict[str, str]] = None
+    ) -> ClientSession:
+        merged_headers = self._merge_headers(headers)
+        session_key = self._generate_session_key(merged_headers)
+
+        async with self._session_lock:
+            if session_key in self._sessions:
+                session, _, owner = self._sessions[session_key]
+                if not owner.done() and not self._is_session_disconnected(session):
+                    return session
+                logger.info("Cleaning up disconnected session: %s", session_key)
+                await self._close_session(session_key)
+
+            ready = asyncio.get_running_loop().create_future()
+            closing = asyncio.Event()
+            owner = asyncio.create_task(
+                self._own_session(merged_headers, ready, closing)
+            )
+            try:
+                session = await asyncio.shield(ready)
+            except asyncio.CancelledError:
+                owner.cancel()
+                raise
+            except Exception as e:
+                raise ConnectionError(f"Failed to create MCP session: {e}") from e
+
+            self._sessions[session_key] = (session, closing, owner)
+            logger.debug("Created new session: %s", session_key)
+            return session
+
+    async def _own_session(
+        self,
+        merged_headers: Optional[dict[str, str]],
+        ready: asyncio.Future,
+        closing: asyncio.Event,
+    ):
+        timeout = getattr(self._connection_params, "timeout", None)
+        try:
+            async with AsyncExitStack() as exit_stack:
+                transports = await exit_stack.enter_async_context(
+                    self._create_client(merged_headers)
+                )
+                # Streamable HTTP also yields a session id callback; the
+                # session only needs the read and write streams.
+                if isinstance(self._connection_params, StdioConnectionParams):
+                    client_session = ClientSession(
+                        *transports[:2],
+                        read_timeout_seconds=timedelta(seconds=timeout),
+                    )
+                else:
+                    client_session = ClientSession(*transports[:2])
+                session = await exit_stack.enter_async_context(client_session)
+                await asyncio.wait_for(session.initialize(), timeout=timeout)
+                ready.set_result(session)
+                await closing.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            elif not closing.is_set():
+                # The transport failed under the open session; the next
+                # create_session sees the finished owner and reconnects.
+                logger.info("MCP session dropped by its transport: %s", e)
+            else:
+                logger.warning("Error during MCP session cleanup: %s", e)
+
+    async def _close_session(self, session_key: str):
+        _, closing, owner = self._sessions.pop(session_key)
+        closing.set()
+        await asyncio.gather(owner, return_exceptions=True)
+
+    async def close(self):
+        """Closes all sessions, each from the task that opened it."""
+        async with self._session_lock:
+            for session_key in list(self._sessions):
+                await self._close_session(session_key)
+
+
+class PooledMcpTool(MCPTool):
+    """MCP tool whose calls run on the owning toolset's connection loop.
+
+    Successful results of the toolset's cacheable tools are served from its
+    result cache, when one is configured, keyed on the tool name and
+    arguments with the free-text fields normalized.
+    """
+
+    def __init__(self, *, toolset: "PooledMcpToolset", **kwargs):
+        super().__init__(**kwargs)
+        self._toolset = toolset
+
+    async def _run_async_impl(self, *, args, tool_context, credential):
+        cache = self._toolset.result_cache
+        cache_key = None
+        if cache is not None and self.name in self._toolset.cacheable_tools:
+            cache_key = make_cache_key(
+                self.name, args, text_fields=self._toolset.cache_text_fields
+            )
+        if cache_key is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        result = await self._toolset.run_on_pool(
+            super()._run_async_impl(
+                args=args, tool_context=tool_context, credential=credential
+            )
+        )
+
+        if cache_key is not None and not result.get("isError"):
+            cache.set(cache_key, result)
+        return result
+
+
+class PooledMcpToolset(McpToolset):
+    """McpToolset that shares one keep-alive MCP session across requests.
+
+    MCP sessions are bound to the event loop that opened them, while the web
+    layer runs every request on its own loop. This toolset therefore owns a
+    background event loop that holds the session for the life of the
+    process; tool listing and tool calls are dispatched onto it. Tool
+    schemas are cached for ``tool_cache_ttl`` seconds, and a periodic ping
+    keeps the connection alive and drops it for reconnection when the server
+    stops answering. An optional ``result_cache`` memoizes the results of
+    ``cacheable_tools``, which should only name read-only tools; string
+    arguments named in ``cache_text_fields`` are matched ignoring case and
+    whitespace.
+    """
+
+    def __init__(
+        self,
+        *,
+        tool_cache_ttl: float = MCP_TOOL_CACHE_TTL,
+        health_check_interval: float = MCP_HEALTH_CHECK_INTERVAL,
+        result_cache: Optional[TTLCache] = None,
+        cacheable_tools: Collection[str] = (),
+        cache_text_fields: Collection[str] = (),
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._mcp_session_manager = PooledMcpSessionManager(
+            connection_params=self._connection_params,
+            errlog=self._errlog,
+        )
+        self.result_cache = result_cache
+        self.cacheable_tools = frozenset(cacheable_tools)
+        self.cache_text_fields = frozenset(cache_text_fields)
+        self._tool_cache_ttl = tool_cache_ttl
+        self._health_check_interval = health_check_interval
+        self._cached_tools: Optional[list[PooledMcpTool]] = None
+        self._cached_at = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name="mcp-connection-pool",
+                    daemon=True,
+                )
+                thread.start()
+                self._loop = loop
+                if self._health_check_interval > 0:
+                    asyncio.run_coroutine_threadsafe(
+                        self._health_check_loop(), loop
+                    )
+            return self._loop
+
+    async def run_on_pool(self, coro):
+        """Await ``coro`` on the connection loop from any other event loop."""
+        loop = self._ensure_loop()
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            return await coro
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(coro, loop)
+        )
+
+    async def get_tools(
+        self,
+        readonly_context: Optional[ReadonlyContext] = None,
+    ) -> list[BaseTool]:
+        if (
+            self._cached_tools is None
+            or time.monotonic() - self._cached_at > self._tool_cache_ttl
+        ):
+            mcp_tools = await self.run_on_pool(self._list_tools())
+            self._cached_tools = [
+                PooledMcpTool(
+                    toolset=self,
+                    mcp_tool=mcp_tool,
+                    mcp_session_manager=self._mcp_session_manager,
+                    auth_scheme=self._auth_scheme,
+                    auth_credential=self._auth_credential,
+                    require_confirmation=self._require_confirmation,
+                    header_provider=self._header_provider,
+                )
+                for mcp_tool in mcp_tools
+            ]
+            self._cached_at = time.monotonic()
+
+        return [
+            tool for tool in self._cached_tools
+            if self._is_tool_selected(tool, readonly_context)
+        ]
+
+    async def _list_tools(self):
+        session = await self._mcp_session_manager.create_session()
+        try:
+            response = await asyncio.wait_for(
+                session.list_tools(), timeout=self._connection_params.timeout
+            )
+        except Exception as e:
+            raise ConnectionError("Failed to get tools from MCP server.") from e
+        return response.tools
+
+    def prefetch_tools(self):
+        """Open the connection and cache tool schemas without blocking."""
+        future = asyncio.run_coroutine_threadsafe(
+            self.get_tools(), self._ensure_loop()
+        )
+        future.add_done_callback(self._log_prefetch_result)
+
+    @staticmethod
+    def _log_prefetch_result(future):
+        if future.exception() is not None:
+            logger.warning("MCP tool prefetch failed: %s", future.exception())
+
+    async def check_health(self) -> bool:
+        """Ping the server, dropping the session and tool cache on failure."""
+        return await self.run_on_pool(self._ping())
+
+    async def _ping(self) -> bool:
+        try:
+            session = await self._mcp_session_manager.create_session()
+            await asyncio.wait_for(
+                session.send_ping(), timeout=self._connection_params.timeout
+            )
+            return True
+        except Exception as e:
+            logger.warning("MCP health check failed, reconnecting: %s", e)
+            await self._mcp_session_manager.close()
+            self._cached_tools = None
+            return False
+
+    async def _health_check_loop(self):
+        while True:
+            await asyncio.sleep(self._health_check_interval)
+            if self._cached_tools is not None:
+                await self._ping()
+
+    async def close(self) -> None:
+        if self._loop is None or self._loop.is_closed():
+            return
+        await self.run_on_pool(super().close())
+        self._cached_tools = None
+        loop, self._loop = self._loop, None
+        loop.call_soon_threadsafe(loop.stop)
@@ -1,13 +1,12 @@
 from google.adk.agents import LlmAgent
 from google.adk.tools import AgentTool
 
-from agents.design.agent import root_agent as design_agent
-from agents.content.agent import root_agent as content_agent
+from agents.marketing_expert.campaign import content_tool, create_campaign_assets_tool, design_tool
 from agents.planner.agent import root_agent as planner_agent
+from agents.utils.response_cache import store_response, use_cached_response
+from agents.utils.router import fast_route_to_tool
 
 plan_tool = AgentTool(planner_agent)
-content_tool = AgentTool(content_agent)
-design_tool = AgentTool(design_agent)
 
 root_agent = LlmAgent(
     model="gemini-2.5-flash",
@@ -62,7 +61,11 @@ You think in terms of:
 3. If content_agent or design_agent is requested directly:
    - Execute the task using the relevant tool without introducing a marketing plan UNLESS explicitly asked.
 
-4. NEVER assume the user wants everything unless they explicitly say so.
+4. If the user wants BOTH content and visual designs (e.g. after accepting a plan):
+   - Use create_campaign_assets with a content brief and a design brief, so both are created at the same time.
+   - Do NOT call content_agent and design_agent one after the other for the same campaign.
+
+5. NEVER assume the user wants everything unless they explicitly say so.
 
 ---
 
@@ -98,10 +101,20 @@ Action: Ask a clarifying question:
 
 ---
 
+Example 5:
+User: "Yes, create the posts and the images for this plan"
+Reasoning: The user accepted the plan and wants both content and designs.
+Action: Use create_campaign_assets with a content brief and a design brief taken from the plan
+
+---
+
 ### FINAL RULES
 - Be concise, structured, and outcome-driven.
 - Delegate all execution to specialized agents.
 - Always maintain clarity before action.
 """,
-    tools=[plan_tool, content_tool, design_tool],
+    tools=[plan_tool, content_tool, design_tool, create_campaign_assets_tool],
+    before_model_callback=fast_route_to_tool,
+    before_tool_callback=use_cached_response,
+    after_tool_callback=store_response,
 )
@@ -0,0 +1,53 @@
+import asyncio
+
+from google.adk.tools import AgentTool, FunctionTool, ToolContext
+
+from agents.content.agent import root_agent as content_agent
+from agents.design.agent import root_agent as design_agent
+from agents.utils.response_cache import store_response, use_cached_response
+
+content_tool = AgentTool(content_agent)
+design_tool = AgentTool(design_agent)
+
+
+async def create_campaign_assets(
+    content_brief: str, design_brief: str, tool_context: ToolContext
+) -> dict:
+    """
+    Creates the written content and the visual designs for a campaign at the same time.
+
+    Use this instead of calling content_agent and design_agent one after the other
+    when the user wants both content and designs, e.g. after accepting a marketing plan.
+
+    Args:
+        content_brief: The full request for content_agent (platforms, formats, tone, key messages).
+        design_brief: The full request for design_agent (every image needed, with its description).
+
+    Returns:
+        dict: {"content": content_agent's answer, "design": design_agent's answer}.
+        If one side fails, its entry holds an "Error: ..." message and the other is still returned.
+    """
+
+    async def run(tool: AgentTool, brief: str):
+        args = {"request": brief}
+        cached = use_cached_response(tool, args, tool_context)
+        if cached is not None:
+            return cached["result"]
+        response = await tool.run_async(args=args, tool_context=tool_context)
+        store_response(tool, args, tool_context, response)
+        return response
+
+    results = await asyncio.gather(
+        run(content_tool, content_brief),
+        run(design_tool, design_brief),
+        return_exceptions=True,
+    )
+
+    return {
+        part: f"Error: {str(result) or type(result).__name__}"
+        if isinstance(result, BaseException) else result
+        for part, result in zip(("content", "design"), results)
+    }
+
+
+create_campaign_assets_tool = FunctionTool(func=create_campaign_assets)
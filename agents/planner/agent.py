@@ -2,9 +2,11 @@ from pathlib import Path
 
 from google.adk.agents import Agent
 
+from agents.utils.prompts import prompt_registry
+
 # Load instruction from planner_prompt.md
 instruction_path = Path(__file__).parent / "planner_prompt.md"
-instruction = instruction_path.read_text()
+instruction = prompt_registry.instruction(instruction_path)
 
 root_agent = Agent(
     model='gemini-2.5-flash',
@@ -0,0 +1,215 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Collection, Optional
+
+
+def normalize_value(value: Any, text_fields: Collection[str] = ()) -> Any:
+    """Normalize a JSON-like value so trivially different requests share a key.
+
+    Strings under a key in ``text_fields`` are free text, so their case and
+    whitespace are folded. Everything else, such as ids and URLs, is kept
+    as is.
+    """
+    if isinstance(value, dict):
+        return {
+            str(k): (
+                " ".join(v.split()).casefold()
+                if k in text_fields and isinstance(v, str)
+                else normalize_value(v, text_fields)
+            )
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [normalize_value(v, text_fields) for v in value]
+    return value
+
+
+def make_cache_key(*parts: Any, text_fields: Collection[str] = ()) -> str:
+    payload = json.dumps(
+        normalize_value(list(parts), text_fields), sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire after ``ttl`` seconds.
+
+    Values must be JSON-serializable. When ``path`` is given, entries are
+    kept in a sqlite database so warm results survive restarts; otherwise
+    they live in process memory.
+    """
+
+    def __init__(self, ttl: float, max_size: int, path: Optional[Path] = None):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._db = None
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._db_get(key) if self._db else self._entries.get(key)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    self._delete(key)
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            if self._db:
+                self._db.execute(
+                    "UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                self._db.commit()
+            else:
+                self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any):
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._lock:
+            if self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value), expires_at, now),
+                )
+                self._db.commit()
+            else:
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db:
+                self._db.execute("DELETE FROM cache")
+                self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._db:
+                return self._db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _db_get(self, key: str) -> Optional[tuple[float, Any]]:
+        row = self._db.execute(
+            "SELECT expires_at, value FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def _delete(self, key: str):
+        if self._db:
+            self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._db.commit()
+        else:
+            self._entries.pop(key, None)
+
+    def _evict(self):
+        if self._db:
+            overflow = self._db.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_size
+            if overflow > 0:
+                self._db.execute(
+                    "DELETE FROM cache WHERE key IN ("
+                    "SELECT key FROM cache ORDER BY accessed_at LIMIT ?)",
+                    (overflow,),
+                )
+                self._db.commit()
+                self.evictions += overflow
+            return
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+class BytesLRUCache:
+    """In-process LRU cache of byte strings bounded by their total size.
+
+    The least recently used entries are dropped once the cached values add
+    up to more than ``max_bytes``; a value larger than that is not cached.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes):
+        with self._lock:
+            self._discard(key)
+            if len(value) > self.max_bytes:
+                return
+            self._entries[key] = value
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def discard(self, key: str):
+        with self._lock:
+            self._discard(key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self),
+            "bytes": self._size,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _discard(self, key: str):
+        value = self._entries.pop(key, None)
+        if value is not None:
+            self._size -= len(value)
@@ -0,0 +1,48 @@
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Union
+
+if TYPE_CHECKING:
+    from google.adk.agents.readonly_context import ReadonlyContext
+
+PROMPT_HOT_RELOAD = os.getenv("PROMPT_HOT_RELOAD", "false").lower() == "true"
+
+
+class PromptRegistry:
+    """Prompt files read once and served from memory.
+
+    With hot reload enabled (PROMPT_HOT_RELOAD=true, meant for development)
+    every lookup stats the file and re-reads it when its mtime changed, so
+    prompt edits take effect without restarting the server.
+    """
+
+    def __init__(self, hot_reload: bool = False):
+        self.hot_reload = hot_reload
+        self._prompts: dict[Path, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Path) -> str:
+        path = Path(path)
+        cached = self._prompts.get(path)
+        if cached is not None and not self.hot_reload:
+            return cached[1]
+
+        mtime = path.stat().st_mtime
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with self._lock:
+            text = path.read_text(encoding="utf-8")
+            self._prompts[path] = (mtime, text)
+        return text
+
+    def instruction(self, path: Path) -> Union[str, Callable[["ReadonlyContext"], str]]:
+        """Agent instruction for ``path``: the text itself, or a reloading provider."""
+        text = self.get(path)
+        if not self.hot_reload:
+            return text
+        return lambda ctx: self.get(path)
+
+
+prompt_registry = PromptRegistry(hot_reload=PROMPT_HOT_RELOAD)
@@ -0,0 +1,61 @@
+import os
+from typing import Any, Optional
+
+from google.adk.tools import AgentTool, BaseTool, ToolContext
+
+from agents.utils.cache import TTLCache, make_cache_key
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH")
+
+# Session state flag; when truthy the session always gets fresh responses.
+RESPONSE_CACHE_BYPASS_KEY = "response_cache_bypass"
+
+# Agents whose answers depend only on the request text. The design agent
+# writes artifacts, so replaying its answer would skip the actual work.
+CACHED_AGENTS = ("planner_agent", "content_agent")
+
+response_cache = TTLCache(
+    ttl=RESPONSE_CACHE_TTL,
+    max_size=RESPONSE_CACHE_SIZE,
+    path=RESPONSE_CACHE_PATH or None,
+)
+
+
+def use_cached_response(
+    tool: BaseTool, args: dict[str, Any], tool_context: ToolContext
+) -> Optional[dict]:
+    """``before_tool_callback`` answering repeated agent requests from the cache."""
+    key = _cache_key(tool, args)
+    if key is None or tool_context.state.get(RESPONSE_CACHE_BYPASS_KEY):
+        return None
+
+    cached = response_cache.get(key)
+    # AgentTool answers are plain text, which ADK wraps the same way.
+    return {"result": cached} if cached is not None else None
+
+
+def store_response(
+    tool: BaseTool, args: dict[str, Any], tool_context: ToolContext, tool_response: Any
+) -> Optional[dict]:
+    """``after_tool_callback`` caching fresh agent answers."""
+    key = _cache_key(tool, args)
+    # Cache hits arrive here already wrapped in a dict; only fresh text is new.
+    if key is not None and isinstance(tool_response, str) and tool_response.strip():
+        response_cache.set(key, tool_response)
+    return None
+
+
+def _cache_key(tool: BaseTool, args: dict[str, Any]) -> Optional[str]:
+    if not RESPONSE_CACHE_ENABLED or not isinstance(tool, AgentTool):
+        return None
+    agent = tool.agent
+    if agent.name not in CACHED_AGENTS:
+        return None
+
+    instruction = agent.instruction if isinstance(agent.instruction, str) else ""
+    return make_cache_key(
+        agent.name, str(agent.model), instruction, args, text_fields=("request",)
+    )
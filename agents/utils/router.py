@@ -0,0 +1,169 @@
+import os
+import re
+import threading
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+FAST_ROUTER_ENABLED = os.getenv("FAST_ROUTER_ENABLED", "true").lower() == "true"
+FAST_ROUTER_MIN_CONFIDENCE = float(os.getenv("FAST_ROUTER_MIN_CONFIDENCE", "0.8"))
+
+
+class KeywordRouter:
+    """Keyword-scoring intent classifier for unambiguous requests.
+
+    Each route has weighted regex patterns; a message scores the summed
+    weight of every pattern it matches. The best route wins only when it
+    holds at least ``min_confidence`` of the total score, so requests that
+    mention several intents (or none) are left to the LLM.
+    """
+
+    def __init__(self, routes: dict[str, list[tuple[str, float]]], min_confidence: float):
+        self.min_confidence = min_confidence
+        self.routed = 0
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+        self._routes = {
+            label: [(re.compile(rf"\b(?:{pattern})\b", re.IGNORECASE), weight)
+                    for pattern, weight in patterns]
+            for label, patterns in routes.items()
+        }
+
+    def scores(self, text: str) -> dict[str, float]:
+        return {
+            label: sum(weight for pattern, weight in patterns if pattern.search(text))
+            for label, patterns in self._routes.items()
+        }
+
+    def classify(self, text: str) -> Optional[tuple[str, float]]:
+        """The confident ``(label, confidence)`` for ``text``, or None."""
+        scores = self.scores(text)
+        total = sum(scores.values())
+        label = max(scores, key=scores.get)
+        confidence = scores[label] / total if total else 0.0
+        with self._lock:
+            if confidence < self.min_confidence:
+                self.fallbacks += 1
+                return None
+            self.routed += 1
+        return label, confidence
+
+    def stats(self) -> dict:
+        decisions = self.routed + self.fallbacks
+        return {
+            "routed": self.routed,
+            "fallbacks": self.fallbacks,
+            "fast_path_rate": self.routed / decisions if decisions else 0.0,
+        }
+
+
+DISCOVERY = r"find|search|discover|look(?:ing)? (?:up|for)|list|recommend|suggest|who are|top|best|shortlist"
+CREATORS = r"influencers?|creators?|youtubers?|tiktokers?|instagrammers?|bloggers?|streamers?|kols?"
+
+WRITING = (
+    r"captions?|posts?|blogs?|articles?|scripts?|ad copy|copy|emails?|newsletters?|"
+    r"taglines?|slogans?|hashtags?|tweets?|threads?|bios?|headlines?|product descriptions?"
+)
+VISUALS = (
+    r"images?|designs?|banners?|thumbnails?|posters?|logos?|visuals?|creatives?|"
+    r"graphics?|mockups?|flyers?|illustrations?|pictures?|infographics?"
+)
+STRATEGY = (
+    r"strategy|strategies|plan|roadmap|launch plan|campaign ideas|content calendar|"
+    r"growth|go[- ]to[- ]market|funnel|positioning|market my|marketing plan"
+)
+
+orchestrator_router = KeywordRouter(
+    {
+        "influencer_search_agent": [
+            (CREATORS, 1.0),
+            (rf"(?:{DISCOVERY})\b.*\b(?:{CREATORS})", 2.0),
+            (r"followers|engagement rate|niche", 0.5),
+        ],
+        "MarketingExpert": [
+            (WRITING, 1.0),
+            (VISUALS, 1.0),
+            (STRATEGY, 1.0),
+            (r"marketing|campaign|brand|promote|launch|ads|advertis\w*|social media", 0.5),
+            (r"influencer marketing|influencer campaign", 1.5),
+        ],
+    },
+    min_confidence=FAST_ROUTER_MIN_CONFIDENCE,
+)
+
+marketing_router = KeywordRouter(
+    {
+        "content_agent": [(WRITING, 1.0), (r"write|draft|rewrite", 1.0)],
+        "design_agent": [(VISUALS, 1.0), (r"draw|generate an? image|make an? image", 1.0)],
+        "planner_agent": [(STRATEGY, 1.5), (r"campaign|platforms", 0.5)],
+    },
+    min_confidence=FAST_ROUTER_MIN_CONFIDENCE,
+)
+
+
+def fast_route_to_agent(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """``before_model_callback`` that transfers clear requests without an LLM call."""
+    label = _classify_first_call(orchestrator_router, callback_context)
+    if label is None:
+        return None
+    return _function_call_response("transfer_to_agent", {"agent_name": label})
+
+
+def fast_route_to_tool(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """``before_model_callback`` that calls the clear AgentTool without an LLM call.
+
+    Only used on the opening request of a conversation: later turns are
+    often follow-ups ("now design a banner for it") that the LLM has to
+    expand with context from the history before delegating.
+    """
+    session = callback_context.session
+    if any(event.invocation_id != callback_context.invocation_id for event in session.events):
+        return None
+
+    label = _classify_first_call(marketing_router, callback_context)
+    if label is None:
+        return None
+    return _function_call_response(label, {"request": _user_text(callback_context)})
+
+
+def _classify_first_call(router: KeywordRouter, callback_context: CallbackContext) -> Optional[str]:
+    if not FAST_ROUTER_ENABLED:
+        return None
+
+    # Only the agent's first model call in a turn decides where to route;
+    # later calls have tool results to work with.
+    if any(
+        event.invocation_id == callback_context.invocation_id
+        and event.author == callback_context.agent_name
+        for event in callback_context.session.events
+    ):
+        return None
+
+    text = _user_text(callback_context)
+    if not text:
+        return None
+
+    result = router.classify(text)
+    return result[0] if result else None
+
+
+def _user_text(callback_context: CallbackContext) -> str:
+    content = callback_context.user_content
+    if not content or not content.parts:
+        return ""
+    return " ".join(part.text for part in content.parts if part.text).strip()
+
+
+def _function_call_response(name: str, args: dict) -> LlmResponse:
+    return LlmResponse(
+        content=types.Content(
+            role="model",
+            parts=[types.Part(function_call=types.FunctionCall(name=name, args=args))],
+        )
+    )
@@ -0,0 +1,242 @@
+import contextvars
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH")
+TRACE_WINDOW = int(os.getenv("TRACE_WINDOW", "500"))
+
+# Traces whose root span has not ended yet are dropped, with a warning,
+# once this many are pending.
+MAX_PENDING_TRACES = 100
+
+# Spans that end after their trace was exported (background writes) are
+# exported on their own while the trace is among this many recent ones.
+MAX_FINISHED_TRACES = 1000
+
+SERVICE_NAME = "brand_boost_ai"
+
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+# Ids of the tool calls enclosing the running code; a run started inside
+# one is an AgentTool run nested in the outer turn. A set, so every plugin
+# that needs to know can mark the same call.
+_open_tools: contextvars.ContextVar[frozenset] = contextvars.ContextVar(
+    "open_tools", default=frozenset()
+)
+
+
+class Span:
+    """One timed operation; ``stage`` groups spans for latency percentiles."""
+
+    def __init__(self, name: str, stage: str, parent: Optional["Span"], attributes: dict):
+        self.name = name
+        self.stage = stage
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent = parent
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": otlp_value(value)}
+                for key, value in {"stage": self.stage, **self.attributes}.items()
+                if value is not None
+            ],
+            "status": {"code": STATUS_UNSET},
+        }
+        if self.parent is not None:
+            span["parentSpanId"] = self.parent.span_id
+        if self.error is not None:
+            span["status"] = {"code": STATUS_ERROR, "message": self.error}
+        return span
+
+
+class Tracer:
+    """Collect spans across the agent hierarchy and summarize them per stage.
+
+    The current span is tracked in a context variable, so spans started in
+    tools, nested AgentTool runs and worker coroutines attach to whatever
+    was running when they began. Each finished trace is appended to
+    ``export_path`` as one OTLP/JSON ``resourceSpans`` line (spans that end
+    after their root follow as lines of their own), and the durations of
+    the last ``window`` spans of every stage are kept for percentiles.
+    """
+
+    def __init__(self, export_path: Optional[Path] = None, window: int = TRACE_WINDOW):
+        self.export_path = Path(export_path) if export_path else None
+        self.window = window
+        self._lock = threading.Lock()
+        self._durations: dict[str, deque] = {}
+        self._pending: "OrderedDict[str, list[Span]]" = OrderedDict()
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def in_tool(self) -> bool:
+        return bool(_open_tools.get())
+
+    def enter_tool(self, call_id: str):
+        _open_tools.set(_open_tools.get() | {call_id})
+
+    def exit_tool(self, call_id: str):
+        _open_tools.set(_open_tools.get() - {call_id})
+
+    def start_span(self, name: str, stage: str, activate: bool = True, **attributes) -> Span:
+        """Start a child of the current span, making it current if ``activate``."""
+        span = Span(name, stage, _current_span.get(), attributes)
+        if activate:
+            _current_span.set(span)
+        return span
+
+    def end_span(self, span: Span, error: Optional[BaseException] = None, **attributes):
+        """Finish ``span`` and make its parent current again (in this context)."""
+        if span.end_ns is not None:
+            return
+        span.end_ns = time.time_ns()
+        span.attributes.update(attributes)
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        if _current_span.get() is span:
+            _current_span.set(span.parent)
+
+        with self._lock:
+            samples = self._durations.setdefault(span.stage, deque(maxlen=self.window))
+            samples.append(span.duration_ms)
+            if self.export_path is None:
+                return
+            if span.trace_id in self._finished:
+                self._export([span])
+                return
+            trace = self._pending.setdefault(span.trace_id, [])
+            trace.append(span)
+            if span.parent is not None:
+                while len(self._pending) > MAX_PENDING_TRACES:
+                    trace_id, spans = self._pending.popitem(last=False)
+                    logger.warning(
+                        "Dropped unfinished trace %s (%d spans): more than %d traces pending",
+                        trace_id, len(spans), MAX_PENDING_TRACES,
+                    )
+                return
+            del self._pending[span.trace_id]
+            self._finished[span.trace_id] = None
+            while len(self._finished) > MAX_FINISHED_TRACES:
+                self._finished.popitem(last=False)
+            self._export(trace)
+
+    @contextmanager
+    def span(self, name: str, stage: str, **attributes):
+        """Time the enclosed block; the yielded span's attributes can be extended."""
+        span = self.start_span(name, stage, **attributes)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, error=e)
+            raise
+        self.end_span(span)
+
+    @contextmanager
+    def scope(self):
+        """Contain the spans of one top-level run.
+
+        A run that raises or is cancelled skips its after-callbacks, so the
+        spans it left open end here with the error, and the current span
+        and open tool calls are restored either way; nothing leaks into later
+        work in this context (Flask copies a view's context back into its
+        worker thread).
+        """
+        outer, open_tools = _current_span.get(), _open_tools.get()
+        try:
+            yield
+        except BaseException as e:
+            span = _current_span.get()
+            while span is not None and span is not outer:
+                self.end_span(span, error=e)
+                span = span.parent
+            raise
+        finally:
+            _current_span.set(outer)
+            _open_tools.set(open_tools)
+
+    def stats(self) -> dict:
+        """Latency percentiles in milliseconds for every stage seen so far."""
+        with self._lock:
+            return {
+                stage: latency_percentiles(samples)
+                for stage, samples in sorted(self._durations.items())
+            }
+
+    def _export(self, spans: list[Span]):
+        payload = {
+            "resourceSpans": [{
+                "resource": {
+                    "attributes": [{"key": "service.name", "value": otlp_value(SERVICE_NAME)}],
+                },
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [span.to_otlp() for span in spans],
+                }],
+            }],
+        }
+        self.export_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.export_path, "a", encoding="utf-8") as export_file:
+            export_file.write(json.dumps(payload) + "\n")
+
+
+def otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def latency_percentiles(samples) -> dict:
+    samples = sorted(samples)
+    return {
+        "samples": len(samples),
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": round(samples[-1], 1),
+    }
+
+
+def percentile(sorted_samples: list, q: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    rank = max(1, -(-len(sorted_samples) * q // 100))
+    return round(sorted_samples[int(rank) - 1], 1)
+
+
+tracer = Tracer(export_path=TRACE_EXPORT_PATH)
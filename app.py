@@ -1,26 +1,23 @@
 from flask import (
     Flask,
+    abort,
+    Response,
     render_template,
     request,
     jsonify,
     session,
     send_from_directory,
+    stream_with_context,
 )
 from flask_cors import CORS
+import asyncio
 import os
 import sys
+import time
 from pathlib import Path
 import uuid
 from dotenv import load_dotenv
 
-# Apply nest_asyncio to allow nested event loops (helps with Flask + async MCP tools)
-import nest_asyncio
-nest_asyncio.apply()
-
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai.types import Content, Part
-
 BASE_DIR = Path(__file__).parent
 AGENTS_DIR = BASE_DIR / "agents"
 
@@ -28,7 +25,32 @@ sys.path.insert(0, str(AGENTS_DIR))
 
 load_dotenv(AGENTS_DIR / ".env")
 
-from agents.agent import root_agent
+from agents.design.utils.artifact_index import artifact_index
+from agents.design.utils.artifact_utils import wait_for_image_write
+from agents.design.utils.renditions import (
+    RENDITION_SIZES,
+    find_rendition,
+    is_immutable,
+    is_unfinished_version,
+)
+from services.chat import (
+    ERROR_MESSAGE,
+    IMMUTABLE_CACHE_CONTROL,
+    JOB_POLL_INTERVAL,
+    JOB_STREAM_MAX_SECONDS,
+    artifacts_etag,
+    cached_artifact,
+    collect_metrics,
+    describe_job,
+    format_sse,
+    job_queue,
+    list_artifacts_page,
+    parse_state_delta,
+    run_chat,
+    stream_chat_events,
+    start_warm_up,
+)
+from services.jobs import FINISHED, JobLimitExceeded
 
 
 app = Flask(__name__)
@@ -37,7 +59,6 @@ app.secret_key = os.environ.get(
 )
 CORS(app)
 
-session_service = InMemorySessionService()
 
 @app.route("/")
 def index():
@@ -58,55 +79,139 @@ async def chat():
                 "response": "Please provide a message."
             }), 400
 
-        await ensure_session_exists(session_id, user_id)
-
-        result = await run_agent(session_id, user_id, user_message)
-        response_text = extract_final_response(result)
+        response_text, images = await run_chat(
+            session_id, user_id, user_message, get_state_delta()
+        )
 
         if not response_text or not response_text.strip():
             app.logger.warning("Agent returned empty response")
             return create_error_response()
 
-        images = extract_image_info(response_text)
         return create_success_response(response_text, images)
 
     except Exception as e:
         app.logger.exception("Chat processing error")
         return create_error_response()
 
+@app.route("/api/chat/stream", methods=["POST"])
+def chat_stream():
+    """Stream agent events to the client as Server-Sent Events."""
+    session_id, user_id = get_or_create_session_ids()
+
+    user_message = get_user_message()
+    if user_message is None:
+        return jsonify({
+            "status": "error",
+            "response": "Please provide a message."
+        }), 400
+
+    events = iterate_async(
+        stream_chat_events(session_id, user_id, user_message, get_state_delta())
+    )
+    return Response(
+        stream_with_context(events),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@app.route("/api/jobs", methods=["POST"])
+def submit_job():
+    """Queue a chat message and return its job id without waiting for the agent."""
+    session_id, user_id = get_or_create_session_ids()
+
+    user_message = get_user_message()
+    if user_message is None:
+        return jsonify({
+            "status": "error",
+            "response": "Please provide a message."
+        }), 400
+
+    try:
+        job = job_queue.submit(
+            user_id,
+            session_id=session_id,
+            user_id=user_id,
+            user_message=user_message,
+            state_delta=get_state_delta(),
+        )
+    except JobLimitExceeded:
+        return jsonify({
+            "status": "error",
+            "response": "Please wait for your earlier requests to finish."
+        }), 429
+
+    return jsonify(describe_job(job)), 202
+
+
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """Current status of a job, with the chat response once it succeeded."""
+    job = get_user_job(job_id)
+    if job is None:
+        return jsonify({"status": "error", "response": "Job not found."}), 404
+    return jsonify(describe_job(job))
+
+
+@app.route("/api/jobs/<job_id>/events", methods=["GET"])
+def job_events(job_id):
+    """Stream a job's status changes as Server-Sent Events until it finishes.
+
+    Polling holds a WSGI worker thread for as long as the stream is open, so
+    a stream ends after JOB_STREAM_MAX_SECONDS; EventSource then reconnects
+    and resumes with the job's current status. asgi.py has no such limit.
+    """
+    if get_user_job(job_id) is None:
+        return jsonify({"status": "error", "response": "Job not found."}), 404
+
+    def events():
+        status = None
+        deadline = time.monotonic() + JOB_STREAM_MAX_SECONDS
+        while time.monotonic() < deadline:
+            job = job_queue.get(job_id)
+            if job is None:
+                yield format_sse("error", {"status": "error", "response": "Job not found."})
+                return
+            if job["status"] != status:
+                status = job["status"]
+                yield format_sse("status", describe_job(job))
+            if status in FINISHED:
+                return
+            time.sleep(JOB_POLL_INTERVAL)
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @app.route("/api/artifacts", methods=["GET"])
 async def list_artifacts():
-    """List all design artifacts."""
+    """List design artifacts, optionally only those changed since ``?since=``.
+
+    Paginated with ``?offset=`` and ``?limit=``. Answers 304 when the
+    client's ETag is still current.
+    """
     try:
-        artifacts_dir = AGENTS_DIR / "design" / "artifacts"
-
-        if not artifacts_dir.exists():
-            return jsonify({"artifacts": []})
-
-        artifacts = []
-        for asset_dir in artifacts_dir.iterdir():
-            if not asset_dir.is_dir():
-                continue
-
-            versions = []
-            for version_file in sorted(asset_dir.glob("v*.png")):
-                try:
-                    version_num = int(version_file.stem[1:])
-                    versions.append({
-                        "version": version_num,
-                        "url": f"/artifacts/{asset_dir.name}/{version_file.name}"
-                    })
-                except ValueError:
-                    continue
-
-            if versions:
-                artifacts.append({
-                    "name": asset_dir.name,
-                    "versions": versions,
-                    "latest": versions[-1]["url"] if versions else None
-                })
-
-        return jsonify({"artifacts": artifacts})
+        cursor = request.args.get("since", 0, type=int)
+        offset = request.args.get("offset", 0, type=int)
+        limit = request.args.get("limit", type=int)
+
+        etag = artifacts_etag(cursor, offset, limit)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = jsonify(list_artifacts_page(cursor, offset, limit))
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
 
     except Exception as e:
         app.logger.exception("Error listing artifacts")
@@ -115,9 +220,40 @@ async def list_artifacts():
 
 @app.route("/artifacts/<path:filename>")
 def serve_artifact(filename):
-    """Serve design artifact images."""
-    artifacts_dir = AGENTS_DIR / "design" / "artifacts"
-    return send_from_directory(artifacts_dir, filename)
+    """Serve design artifact images, or a smaller WebP rendition with ``?size=``."""
+    size = request.args.get("size")
+    if size:
+        if size not in RENDITION_SIZES:
+            return jsonify({"status": "error", "response": "Unknown size."}), 400
+        wait_for_image_write(filename)
+        filename = find_rendition(filename, size)
+        if filename is None:
+            abort(404)
+    else:
+        cached = cached_artifact(filename)
+        if cached is not None:
+            data, etag = cached
+            response = Response(data, mimetype="image/png")
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+            return response.make_conditional(request)
+
+    # Both checks come before the file is opened, so a version is only ever
+    # read (and marked immutable) once it has been completely written.
+    if is_unfinished_version(filename):
+        return Response(status=404, headers={"Cache-Control": "no-store"})
+    immutable = is_immutable(filename)
+
+    response = send_from_directory(artifact_index.artifacts_dir, filename)
+    if immutable:
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+
+@app.route("/api/metrics", methods=["GET"])
+def metrics():
+    """Prompt token usage, per-stage latency, cache and routing counters."""
+    return jsonify(collect_metrics())
 
 
 @app.route("/api/new-session", methods=["POST"])
@@ -153,95 +289,58 @@ def get_user_message():
     return user_message
 
 
-async def ensure_session_exists(session_id, user_id):
-    existing_session = None
-    try:
-        existing_session = await session_service.get_session(
-            app_name="brand_boost_ai",
-            user_id=user_id,
-            session_id=session_id
-        )
-    except Exception:
-        pass
-
-    if not existing_session:
-        await session_service.create_session(
-            app_name="brand_boost_ai",
-            user_id=user_id,
-            session_id=session_id
-        )
-
-
-async def run_agent(session_id, user_id, user_message):
-    message_content = Content(parts=[Part(text=user_message)], role="user")
-
-    runner = Runner(
-        app_name="brand_boost_ai",
-        agent=root_agent,
-        session_service=session_service,
-    )
-
-    events = []
-    async for event in runner.run_async(
-        session_id=session_id,
-        user_id=user_id,
-        new_message=message_content
-    ):
-        events.append(event)
+def get_state_delta():
+    return parse_state_delta(request.get_json())
 
-    return events
 
+def iterate_async(async_gen):
+    """Drive an async generator from a synchronous WSGI response body.
 
-def extract_final_response(result):
-    for event in result:
-        if event.is_final_response() and event.content and event.content.parts:
-            return event.content.parts[0].text
-    return ""
+    The generator runs in a single task for its whole life, so context
+    variables set while producing one item (such as the current trace span)
+    are still set when it produces the next.
+    """
+    loop = asyncio.new_event_loop()
+    items = asyncio.Queue(maxsize=1)
+    done = object()
 
+    async def pump():
+        try:
+            async for item in async_gen:
+                await items.put((item, None))
+            await items.put((done, None))
+        except Exception as e:
+            await items.put((done, e))
+        finally:
+            await async_gen.aclose()
 
-def extract_image_info(text: str) -> list:
-    import time
-    images = []
-    artifacts_dir = AGENTS_DIR / "design" / "artifacts"
-
-    if not artifacts_dir.exists():
-        return images
-
-    current_time = time.time()
-    threshold = 30
-
-    for asset_dir in artifacts_dir.iterdir():
-        if not asset_dir.is_dir():
-            continue
-
-        recent_versions = []
-        for version_file in sorted(asset_dir.glob("v*.png")):
-            if current_time - version_file.stat().st_mtime <= threshold:
-                try:
-                    version_num = int(version_file.stem[1:])
-                    recent_versions.append({
-                        "version": version_num,
-                        "url": f"/artifacts/{asset_dir.name}/{version_file.name}",
-                        "mtime": version_file.stat().st_mtime
-                    })
-                except ValueError:
-                    continue
-
-        if recent_versions:
-            recent_versions.sort(key=lambda x: x["mtime"], reverse=True)
-            images.append({
-                "name": asset_dir.name,
-                "versions": [{"version": v["version"], "url": v["url"]} for v in recent_versions],
-                "latest": recent_versions[0]["url"]
-            })
-
-    return images
+    task = loop.create_task(pump())
+    try:
+        while True:
+            item, error = loop.run_until_complete(items.get())
+            if error is not None:
+                raise error
+            if item is done:
+                break
+            yield item
+    finally:
+        task.cancel()
+        loop.run_until_complete(asyncio.gather(task, return_exceptions=True))
+        loop.close()
+
+
+def get_user_job(job_id):
+    _, user_id = get_or_create_session_ids()
+    job = job_queue.get(job_id)
+    if job is None or job["user_id"] != user_id:
+        return None
+    return job
 
 
 def create_error_response():
     return jsonify({
         "status": "error",
-        "response": "We're experiencing technical difficulties at the moment. Please try again in a few moments."
+        "response": ERROR_MESSAGE
     }), 500
 
 
@@ -253,6 +352,11 @@ def create_success_response(response_text, images):
     })
 
 
+# Builds the agent graph in the background, so the first chat finds it ready.
+if os.environ.get("WARM_UP_AGENTS", "true").lower() == "true":
+    start_warm_up()
+
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5001))
     debug = os.environ.get("FLASK_DEBUG", "true").lower() == "true"
@@ -0,0 +1,358 @@
+"""ASGI entry point serving the same API as app.py on one shared event loop.
+
+Run with:
+    uvicorn asgi:app --port 5001
+
+Unlike Flask, which starts a fresh event loop for every async view, every
+request here runs on the server's single loop, so concurrent chats are
+limited by awaits on the model rather than by worker threads.
+"""
+import asyncio
+import logging
+import os
+import sys
+import uuid
+from pathlib import Path
+
+from dotenv import load_dotenv
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.requests import Request
+from starlette.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+from starlette.templating import Jinja2Templates
+
+BASE_DIR = Path(__file__).parent
+AGENTS_DIR = BASE_DIR / "agents"
+
+sys.path.insert(0, str(AGENTS_DIR))
+
+load_dotenv(AGENTS_DIR / ".env")
+
+from agents.design.utils.artifact_index import artifact_index
+from agents.design.utils.artifact_utils import wait_for_image_write
+from agents.design.utils.renditions import (
+    RENDITION_SIZES,
+    find_rendition,
+    is_immutable,
+    is_unfinished_version,
+)
+from services.chat import (
+    ERROR_MESSAGE,
+    IMMUTABLE_CACHE_CONTROL,
+    JOB_POLL_INTERVAL,
+    artifacts_etag,
+    cached_artifact,
+    collect_metrics,
+    describe_job,
+    format_sse,
+    job_queue,
+    list_artifacts_page,
+    parse_state_delta,
+    run_chat,
+    stream_chat_events,
+    start_warm_up,
+)
+from services.jobs import FINISHED, JobLimitExceeded
+
+logger = logging.getLogger(__name__)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+templates = Jinja2Templates(directory=BASE_DIR / "templates")
+# index.html uses Flask's url_for("static", filename=...) signature.
+templates.env.globals["url_for"] = lambda endpoint, filename: f"/static/{filename}"
+
+
+async def index(request: Request):
+    if "session_id" not in request.session:
+        request.session["session_id"] = str(uuid.uuid4())
+    return templates.TemplateResponse(request, "index.html")
+
+
+async def chat(request: Request):
+    try:
+        session_id, user_id = get_or_create_session_ids(request)
+
+        data = await get_json(request)
+        user_message = get_user_message(data)
+        if user_message is None:
+            return missing_message_response()
+
+        response_text, images = await run_chat(
+            session_id, user_id, user_message, parse_state_delta(data)
+        )
+
+        if not response_text or not response_text.strip():
+            logger.warning("Agent returned empty response")
+            return create_error_response()
+
+        return JSONResponse({
+            "status": "success",
+            "response": response_text,
+            "images": images,
+        })
+
+    except Exception:
+        logger.exception("Chat processing error")
+        return create_error_response()
+
+
+async def chat_stream(request: Request):
+    """Stream agent events to the client as Server-Sent Events."""
+    session_id, user_id = get_or_create_session_ids(request)
+
+    data = await get_json(request)
+    user_message = get_user_message(data)
+    if user_message is None:
+        return missing_message_response()
+
+    return StreamingResponse(
+        stream_chat_events(session_id, user_id, user_message, parse_state_delta(data)),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+async def submit_job(request: Request):
+    """Queue a chat message and return its job id without waiting for the agent."""
+    session_id, user_id = get_or_create_session_ids(request)
+
+    data = await get_json(request)
+    user_message = get_user_message(data)
+    if user_message is None:
+        return missing_message_response()
+
+    try:
+        job = job_queue.submit(
+            user_id,
+            session_id=session_id,
+            user_id=user_id,
+            user_message=user_message,
+            state_delta=parse_state_delta(data),
+        )
+    except JobLimitExceeded:
+        return JSONResponse({
+            "status": "error",
+            "response": "Please wait for your earlier requests to finish."
+        }, status_code=429)
+
+    return JSONResponse(describe_job(job), status_code=202)
+
+
+async def get_job(request: Request):
+    """Current status of a job, with the chat response once it succeeded."""
+    job = get_user_job(request, request.path_params["job_id"])
+    if job is None:
+        return job_not_found_response()
+    return JSONResponse(describe_job(job))
+
+
+async def job_events(request: Request):
+    """Stream a job's status changes as Server-Sent Events until it finishes."""
+    job_id = request.path_params["job_id"]
+    if get_user_job(request, job_id) is None:
+        return job_not_found_response()
+
+    async def events():
+        status = None
+        while True:
+            job = job_queue.get(job_id)
+            if job is None:
+                yield format_sse("error", {"status": "error", "response": "Job not found."})
+                return
+            if job["status"] != status:
+                status = job["status"]
+                yield format_sse("status", describe_job(job))
+            if status in FINISHED:
+                return
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+async def list_artifacts(request: Request):
+    """List design artifacts, optionally only those changed since ``?since=``.
+
+    Paginated with ``?offset=`` and ``?limit=``. Answers 304 when the
+    client's ETag is still current.
+    """
+    try:
+        cursor = get_int_param(request, "since", 0)
+        offset = get_int_param(request, "offset", 0)
+        limit = get_int_param(request, "limit")
+
+        etag = f'"{artifacts_etag(cursor, offset, limit)}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        return JSONResponse(list_artifacts_page(cursor, offset, limit), headers=headers)
+
+    except Exception:
+        logger.exception("Error listing artifacts")
+        return JSONResponse({"artifacts": []})
+
+
+async def serve_artifact(request: Request):
+    """Serve design artifact images, or a smaller WebP rendition with ``?size=``."""
+    filename = request.path_params["filename"]
+    size = request.query_params.get("size")
+    if size:
+        if size not in RENDITION_SIZES:
+            return JSONResponse({"status": "error", "response": "Unknown size."}, status_code=400)
+        await asyncio.to_thread(wait_for_image_write, filename)
+        filename = await asyncio.to_thread(find_rendition, filename, size)
+        if filename is None:
+            return Response(status_code=404)
+    else:
+        cached = await asyncio.to_thread(cached_artifact, filename)
+        if cached is not None:
+            data, etag = cached
+            headers = {"ETag": f'"{etag}"', "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+            if etag_matches(request, headers["ETag"]):
+                return Response(status_code=304, headers=headers)
+            return Response(data, media_type="image/png", headers=headers)
+
+    # Both checks come before the file is read, so a version is only ever
+    # served (and marked immutable) once it has been completely written.
+    if is_unfinished_version(filename):
+        return Response(status_code=404, headers={"Cache-Control": "no-store"})
+    immutable = is_immutable(filename)
+
+    root = artifact_index.artifacts_dir.resolve()
+    path = (root / filename).resolve()
+    if not path.is_relative_to(root) or not path.is_file():
+        return Response(status_code=404)
+
+    stat = path.stat()
+    headers = {"ETag": f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'}
+    if immutable:
+        headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, headers=headers, stat_result=stat)
+
+
+async def metrics(request: Request):
+    """Prompt token usage, per-stage latency, cache and routing counters."""
+    return JSONResponse(collect_metrics())
+
+
+async def new_session(request: Request):
+    """Create a new chat session."""
+    request.session["session_id"] = str(uuid.uuid4())
+    request.session["user_id"] = str(uuid.uuid4())
+    return JSONResponse({"status": "success"})
+
+
+def get_or_create_session_ids(request: Request):
+    session = request.session
+    session_id = session.get("session_id")
+    user_id = session.get("user_id")
+
+    if not session_id:
+        session_id = str(uuid.uuid4())
+        session["session_id"] = session_id
+
+    if not user_id:
+        user_id = str(uuid.uuid4())
+        session["user_id"] = user_id
+
+    return session_id, user_id
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match", "")
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def get_int_param(request: Request, key: str, default=None):
+    try:
+        return int(request.query_params[key])
+    except (KeyError, ValueError):
+        return default
+
+
+async def get_json(request: Request) -> dict:
+    try:
+        data = await request.json()
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def get_user_message(data: dict):
+    user_message = str(data.get("message", "")).strip()
+
+    if not user_message:
+        return None
+
+    return user_message
+
+
+def get_user_job(request: Request, job_id: str):
+    _, user_id = get_or_create_session_ids(request)
+    job = job_queue.get(job_id)
+    if job is None or job["user_id"] != user_id:
+        return None
+    return job
+
+
+def missing_message_response():
+    return JSONResponse({
+        "status": "error",
+        "response": "Please provide a message."
+    }, status_code=400)
+
+
+def job_not_found_response():
+    return JSONResponse({"status": "error", "response": "Job not found."}, status_code=404)
+
+
+def create_error_response():
+    return JSONResponse({
+        "status": "error",
+        "response": ERROR_MESSAGE
+    }, status_code=500)
+
+
+app = Starlette(
+    routes=[
+        Route("/", index),
+        Route("/api/chat", chat, methods=["POST"]),
+        Route("/api/chat/stream", chat_stream, methods=["POST"]),
+        Route("/api/jobs", submit_job, methods=["POST"]),
+        Route("/api/jobs/{job_id}", get_job, methods=["GET"]),
+        Route("/api/jobs/{job_id}/events", job_events, methods=["GET"]),
+        Route("/api/artifacts", list_artifacts, methods=["GET"]),
+        Route("/api/metrics", metrics, methods=["GET"]),
+        Route("/api/new-session", new_session, methods=["POST"]),
+        Route("/artifacts/{filename:path}", serve_artifact, methods=["GET", "HEAD"]),
+        Mount("/static", StaticFiles(directory=BASE_DIR / "static"), name="static"),
+    ],
+    middleware=[
+        Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"]),
+        Middleware(
+            SessionMiddleware,
+            secret_key=os.environ.get("FLASK_SECRET_KEY", "dev-secret-key-change-in-production"),
+        ),
+    ],
+)
+
+
+# Builds the agent graph in the background, so the first chat finds it ready.
+if os.environ.get("WARM_UP_AGENTS", "true").lower() == "true":
+    start_warm_up()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("PORT", 5001)))
@@ -0,0 +1,129 @@
+"""Concurrency stress test for design artifact version allocation.
+
+Saves many small, distinct PNGs for the same asset name from several
+processes, each running several threads, into a throwaway artifacts
+directory, then checks that every save got its own version, no file was
+overwritten or left half-written, the manifest agrees with what is on
+disk, every version has its renditions, and no background write or
+rendition logged a failure.
+
+Usage:
+    python benchmarks/artifact_allocation_stress.py [processes] [threads] [saves_per_thread]
+"""
+import io
+import logging
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+ASSET_NAME = "campaign_banner"
+
+
+def create_png(label: str) -> bytes:
+    """A 32x32 grayscale PNG whose pixels repeat ``label``, so each save differs."""
+    pixels = (label.encode() * 1024)[:1024]
+    buffer = io.BytesIO()
+    Image.frombytes("L", (32, 32), pixels).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class FailureCounter(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def save_many(worker_id, threads, saves_per_thread):
+    from google.genai import types
+
+    from agents.design.utils.artifact_utils import save_image, wait_for_image_writes
+    from agents.design.utils.renditions import wait_for_renditions
+
+    # Background writes and renditions only report failures by logging them.
+    failures = FailureCounter()
+    logging.getLogger("agents.design").addHandler(failures)
+
+    def save_batch(thread_id):
+        saved = []
+        for i in range(saves_per_thread):
+            payload = create_png(f"{worker_id}:{thread_id}:{i}")
+            image = types.Image(image_bytes=payload, mime_type="image/png")
+            saved.append((save_image(image, ASSET_NAME).name, payload))
+        return saved
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        saved = [item for batch in pool.map(save_batch, range(threads)) for item in batch]
+    wait_for_image_writes()
+    wait_for_renditions()
+    return saved, failures.messages
+
+
+def main():
+    processes, threads, saves_per_thread = (
+        [int(arg) for arg in sys.argv[1:4]] + [4, 8, 25][len(sys.argv[1:4]):]
+    )
+    artifacts_dir = Path(tempfile.mkdtemp(prefix="artifacts-stress-"))
+    os.environ["DESIGN_ARTIFACTS_DIR"] = str(artifacts_dir)
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [
+            pool.submit(save_many, worker_id, threads, saves_per_thread)
+            for worker_id in range(processes)
+        ]
+        results = [future.result() for future in futures]
+    saved = [item for items, _ in results for item in items]
+    failures = [message for _, messages in results for message in messages]
+
+    from agents.design.utils.artifact_index import ArtifactIndex
+    from agents.design.utils.renditions import RENDITION_SIZES, rendition_path
+
+    expected = processes * threads * saves_per_thread
+    file_names = [name for name, _ in saved]
+    asset_dir = artifacts_dir / ASSET_NAME
+    corrupted = [
+        name for name, payload in saved
+        if (asset_dir / name).read_bytes() != payload
+    ]
+    on_disk = sorted(p.name for p in asset_dir.glob("v*.png"))
+    leftovers = sorted(p.name for p in asset_dir.glob(".*.tmp"))
+    indexed = ArtifactIndex(artifacts_dir).versions(ASSET_NAME)
+    missing_renditions = [
+        name for name in on_disk
+        if not all(rendition_path(asset_dir / name, size).exists() for size in RENDITION_SIZES)
+    ]
+
+    print(f"saves:             {expected}")
+    print(f"distinct versions: {len(set(file_names))}")
+    print(f"files on disk:     {len(on_disk)}")
+    print(f"indexed versions:  {len(indexed)}")
+    print(f"overwritten files: {len(corrupted)}")
+    print(f"temp leftovers:    {len(leftovers)}")
+    print(f"no renditions:     {len(missing_renditions)}")
+    print(f"logged failures:   {len(failures)}")
+    for message in failures[:5]:
+        print(f"  {message}")
+
+    ok = (
+        len(set(file_names)) == expected
+        and len(on_disk) == expected
+        and indexed == list(range(1, expected + 1))
+        and not corrupted
+        and not leftovers
+        and not missing_renditions
+        and not failures
+    )
+    print("OK" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Offline stand-ins for every remote backend the agents call.
+
+``install_fake_backends`` puts the whole app in a deterministic offline
+mode: every agent model becomes a FakeLlm (see fake_llm.py), the genai
+client used by the design tools returns a fixed PNG, and the Firecrawl
+MCP toolset is replaced by a local search tool. Each fake waits for its
+configured latency, so the web layer, agent plumbing and image saving can
+be load tested without network access or API quota.
+"""
+import asyncio
+import io
+import json
+import uuid
+from types import SimpleNamespace
+
+from google.adk.agents import LlmAgent
+from google.adk.tools import AgentTool, BaseTool
+from google.adk.tools.base_toolset import BaseToolset
+from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
+from google.genai import types
+from PIL import Image
+
+from fake_llm import install_fake_llm
+
+FAKE_SEARCH_TOOL = "firecrawl_search"
+
+
+def create_png(size: int = 1024) -> bytes:
+    """A noisy PNG, so saves and renditions work on a realistically sized file."""
+    buffer = io.BytesIO()
+    Image.effect_noise((size, size), 24).convert("RGB").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class FakeGenaiModels:
+    def __init__(self, latency: float, image_bytes: bytes):
+        self.latency = latency
+        self.image_bytes = image_bytes
+        self.calls = 0
+
+    async def generate_content(self, *, model: str, contents, config=None):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return types.GenerateContentResponse(candidates=[
+            types.Candidate(content=types.Content(role="model", parts=[
+                types.Part.from_bytes(data=self.image_bytes, mime_type="image/png"),
+            ])),
+        ])
+
+
+class FakeGenaiClient:
+    """Answers ``client.aio.models.generate_content`` with one fixed image."""
+
+    def __init__(self, latency: float, image_bytes: bytes):
+        self.aio = SimpleNamespace(models=FakeGenaiModels(latency, image_bytes), aclose=self.aclose)
+
+    async def aclose(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeSearchTool(BaseTool):
+    """Local replacement for Firecrawl's search tool with canned results."""
+
+    def __init__(self, latency: float):
+        super().__init__(name=FAKE_SEARCH_TOOL, description="Search the web.")
+        self.latency = latency
+
+    def _get_declaration(self) -> types.FunctionDeclaration:
+        return types.FunctionDeclaration(
+            name=self.name,
+            description=self.description,
+            parameters=types.Schema(
+                type=types.Type.OBJECT,
+                properties={"query": types.Schema(type=types.Type.STRING)},
+                required=["query"],
+            ),
+        )
+
+    async def run_async(self, *, args, tool_context) -> dict:
+        await asyncio.sleep(self.latency)
+        results = [
+            {
+                "url": f"https://www.instagram.com/creator_{i}/",
+                "title": f"Creator {i} ({args.get('query', '')})",
+                "description": f"{(i + 1) * 12}k followers, posts weekly.",
+            }
+            for i in range(5)
+        ]
+        return {"content": [{"type": "text", "text": json.dumps(results)}], "isError": False}
+
+
+class FakeMcpToolset(BaseToolset):
+    def __init__(self, latency: float):
+        super().__init__()
+        self._tools = [FakeSearchTool(latency)]
+
+    async def get_tools(self, readonly_context=None) -> list[BaseTool]:
+        return self._tools
+
+    async def close(self):
+        pass
+
+
+def replace_mcp_toolsets(agent, latency: float, visited=None):
+    visited = set() if visited is None else visited
+    if agent.name in visited:
+        return
+    visited.add(agent.name)
+
+    if isinstance(agent, LlmAgent):
+        agent.tools = [
+            FakeMcpToolset(latency) if isinstance(tool, McpToolset) else tool
+            for tool in agent.tools
+        ]
+        for tool in agent.tools:
+            if isinstance(tool, AgentTool):
+                replace_mcp_toolsets(tool.agent, latency, visited)
+
+    for sub_agent in agent.sub_agents:
+        replace_mcp_toolsets(sub_agent, latency, visited)
+
+
+def install_fake_backends(
+    agent, llm_latency: float, image_latency: float, mcp_latency: float
+) -> FakeGenaiClient:
+    """Swap the model, genai client and MCP backends of the whole app.
+
+    The design and influencer agents' fake models call one tool
+    (``create_image`` / the fake search) before answering, so those
+    requests exercise the design tools and the MCP path end to end.
+    """
+    from agents.design.utils import genai_client
+
+    client = FakeGenaiClient(image_latency, create_png())
+    genai_client._create_client = lambda: client
+
+    replace_mcp_toolsets(agent, mcp_latency)
+    install_fake_llm(agent, llm_latency, tool_calls={
+        "design_agent": lambda: types.FunctionCall(name="create_image", args={
+            "name": f"bench_{uuid.uuid4().hex[:8]}",
+            "design_instructions": "A bold launch banner with the product centered.",
+        }),
+        "influencer_search_agent": lambda: types.FunctionCall(name=FAKE_SEARCH_TOOL, args={
+            "query": "fitness influencers instagram",
+        }),
+    })
+    return client
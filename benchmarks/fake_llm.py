@@ -0,0 +1,60 @@
+"""Offline stand-in for Gemini, for benchmarks that exercise the real stack.
+
+``install_fake_llm`` swaps the model of every agent in the tree (sub-agents
+and AgentTool-wrapped agents) for a FakeLlm that waits ``latency`` seconds
+and answers with fixed text, so request handling can be measured without
+network access or an API key. Agents listed in ``tool_calls`` first call
+the given tool, then answer once its response is in.
+"""
+import asyncio
+from typing import AsyncGenerator, Callable, Optional
+
+from google.adk.agents import LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.tools import AgentTool
+from google.genai import types
+
+
+class FakeLlm(BaseLlm):
+    model: str = "fake-llm"
+    latency: float = 0.5
+    reply: str = "Here is a short answer from the fake model."
+    tool_call: Optional[Callable[[], types.FunctionCall]] = None
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        await asyncio.sleep(self.latency)
+        prompt_chars = sum(
+            len(part.text or "")
+            for content in llm_request.contents
+            for part in content.parts or []
+        )
+        last_parts = (llm_request.contents[-1].parts or []) if llm_request.contents else []
+        if self.tool_call is not None and not any(p.function_response for p in last_parts):
+            part = types.Part(function_call=self.tool_call())
+        else:
+            part = types.Part(text=self.reply)
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_chars // 4,
+            ),
+        )
+
+
+def install_fake_llm(agent, latency: float, tool_calls=None, visited=None):
+    tool_calls = tool_calls or {}
+    visited = set() if visited is None else visited
+    if agent.name in visited:
+        return
+    visited.add(agent.name)
+
+    if isinstance(agent, LlmAgent):
+        agent.model = FakeLlm(latency=latency, tool_call=tool_calls.get(agent.name))
+        for tool in agent.tools:
+            if isinstance(tool, AgentTool):
+                install_fake_llm(tool.agent, latency, tool_calls, visited)
+
+    for sub_agent in agent.sub_agents:
+        install_fake_llm(sub_agent, latency, tool_calls, visited)
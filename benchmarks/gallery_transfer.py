@@ -0,0 +1,100 @@
+"""Bytes transferred by a first versus a repeated gallery load.
+
+A gallery load fetches /api/artifacts and the thumbnail of every asset. A
+browser repeating it sends the ETags it kept as If-None-Match, so every
+response should come back as an empty 304. Both front ends (app.py and
+asgi.py) are measured in-process against a throwaway artifacts directory.
+
+Usage:
+    python benchmarks/gallery_transfer.py [assets] [versions_per_asset]
+"""
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def create_artifacts(assets: int, versions: int):
+    import io
+
+    from google.genai import types
+    from PIL import Image
+
+    from agents.design.utils.artifact_utils import save_image, wait_for_image_writes
+    from agents.design.utils.renditions import create_renditions
+
+    saved = []
+    for asset in range(assets):
+        for version in range(versions):
+            buffer = io.BytesIO()
+            Image.effect_noise((1024, 1024), 64 + version).convert("RGB").save(buffer, "PNG")
+            image = types.Image(image_bytes=buffer.getvalue(), mime_type="image/png")
+            saved.append(save_image(image, f"asset-{asset}"))
+
+    wait_for_image_writes()
+    for path in saved:
+        create_renditions(path)
+
+
+def load_gallery(client, cache: dict) -> tuple[int, int]:
+    """Fetch the listing and all thumbnails, revalidating against ``cache``.
+
+    ``cache`` maps URL to (ETag, body) like a browser cache. Returns the
+    number of body bytes received and how many responses were 304s.
+    """
+    received = not_modified = 0
+
+    def fetch(url):
+        nonlocal received, not_modified
+        headers = {"If-None-Match": cache[url][0]} if url in cache else {}
+        response = client.get(url, headers=headers)
+        body = response.get_data() if hasattr(response, "get_data") else response.content
+        received += len(body)
+        if response.status_code == 304:
+            not_modified += 1
+            return cache[url][1]
+        assert response.status_code == 200, (url, response.status_code)
+        cache[url] = (response.headers["ETag"], body)
+        return body
+
+    listing = json.loads(fetch("/api/artifacts"))
+    for artifact in listing["artifacts"]:
+        fetch(artifact["thumbnail"])
+    return received, not_modified
+
+
+def main():
+    assets = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    versions = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+
+    os.environ["DESIGN_ARTIFACTS_DIR"] = tempfile.mkdtemp(prefix="gallery-")
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+    os.environ.setdefault("SESSION_DB_URL", "memory")
+    os.environ["WARM_UP_AGENTS"] = "false"
+    sys.path.insert(0, str(ROOT))
+
+    from starlette.testclient import TestClient
+
+    import app
+    import asgi
+
+    create_artifacts(assets, versions)
+    print(f"assets={assets} versions/asset={versions}")
+
+    clients = {
+        "flask": app.app.test_client(),
+        "asgi": TestClient(asgi.app),
+    }
+    for kind, client in clients.items():
+        cache = {}
+        first, _ = load_gallery(client, cache)
+        repeat, not_modified = load_gallery(client, cache)
+        print(f"{kind:>5}: first load {first:>9,} bytes  "
+              f"repeat load {repeat:>6,} bytes  ({not_modified}/{assets + 1} not modified)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Micro-benchmark: a new genai client per call versus the shared client.
+
+Starts a local HTTP/1.1 stub of the Gemini generateContent endpoint and
+points genai at it through GOOGLE_GEMINI_BASE_URL, so no API quota is used.
+Like Flask's async views, every call runs in its own ``asyncio.run`` on one
+of ``concurrency`` worker threads. Reports calls/second and how many TCP
+connections the stub accepted for both strategies.
+
+Usage:
+    python benchmarks/genai_client_benchmark.py [calls] [concurrency]
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from google import genai
+
+from agents.design.utils.genai_client import generate_content
+
+RESPONSE = json.dumps({
+    "candidates": [{"content": {"role": "model", "parts": [{"text": "ok"}]}}]
+}).encode()
+
+
+class StubGeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        StubGeminiHandler.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(RESPONSE)))
+        self.end_headers()
+        self.wfile.write(RESPONSE)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_calls(call, calls, concurrency) -> tuple[float, int]:
+    """Calls/second and connections opened, one event loop per call."""
+    connections = StubGeminiHandler.connections
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda _: asyncio.run(call()), range(calls)))
+    elapsed = time.perf_counter() - start
+    return calls / elapsed, StubGeminiHandler.connections - connections
+
+
+async def call_with_new_client():
+    client = genai.Client(api_key=os.environ["GOOGLE_API_KEY"])
+    await client.aio.models.generate_content(model="gemini-2.5-flash-image", contents=["ping"])
+
+
+async def call_with_shared_client():
+    await generate_content(model="gemini-2.5-flash-image", contents=["ping"])
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGeminiHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["GOOGLE_GEMINI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark-key")
+
+    per_call, per_call_connections = run_calls(call_with_new_client, calls, concurrency)
+    shared, shared_connections = run_calls(call_with_shared_client, calls, concurrency)
+
+    print(f"calls: {calls}, concurrency: {concurrency}")
+    print(f"client per call: {per_call:8.1f} calls/s  {per_call_connections:4} connections")
+    print(f"shared client:   {shared:8.1f} calls/s  {shared_connections:4} connections")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Compare prompt size per turn with and without history compaction.
+
+Runs a multi-turn conversation against an agent backed by a fake model
+that replies with a long plan (like the planner does) and reports prompt
+tokens as roughly one token per four characters of the request, plus the
+extra summarization calls compaction makes. No network access or API key
+is needed.
+
+Usage:
+    python benchmarks/history_compaction.py [turns] [interval] [overlap]
+"""
+import asyncio
+import sys
+from pathlib import Path
+from typing import AsyncGenerator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from google.adk.agents import LlmAgent
+from google.adk.apps import App
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from services.prompt_metrics import PromptTokenMetrics
+from services.session_store import create_compaction_config
+
+PLAN = "Week {week}: post three reels, two carousels and one story poll per platform. " * 40
+SUMMARY = "Summary: the user is planning a multi-platform launch; weekly plans agreed."
+
+summary_usage = {"calls": 0, "prompt_tokens": 0}
+
+
+class FakePlannerLlm(BaseLlm):
+    model: str = "fake-planner"
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        prompt = "".join(
+            part.text or ""
+            for content in llm_request.contents
+            for part in content.parts or []
+        )
+        prompt += str(llm_request.config.system_instruction or "")
+        is_summary = prompt.startswith("The following is a conversation history")
+        reply = SUMMARY if is_summary else PLAN.format(week=len(llm_request.contents))
+        if is_summary:
+            summary_usage["calls"] += 1
+            summary_usage["prompt_tokens"] += len(prompt) // 4
+
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=reply)]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=len(prompt) // 4,
+            ),
+        )
+
+
+async def run_conversation(turns, compaction_config):
+    metrics = PromptTokenMetrics(window=turns)
+    # Without an explicit summarizer, compaction uses the root agent's model.
+    agent = LlmAgent(name="planner", model=FakePlannerLlm(), instruction="You plan campaigns.")
+    agent_app = App(
+        name="bench",
+        root_agent=agent,
+        plugins=[metrics],
+        events_compaction_config=compaction_config,
+    )
+    runner = Runner(app=agent_app, session_service=InMemorySessionService())
+    session = await runner.session_service.create_session(app_name="bench", user_id="u")
+
+    per_turn = []
+    for turn in range(turns):
+        message = types.Content(
+            role="user", parts=[types.Part(text=f"Plan week {turn + 1} of the launch.")]
+        )
+        async for _ in runner.run_async(
+            user_id="u", session_id=session.id, new_message=message
+        ):
+            pass
+        per_turn.append(metrics.snapshot()["per_turn"]["bench"]["last"])
+    return per_turn
+
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    interval = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    overlap = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+
+    baseline = asyncio.run(run_conversation(turns, None))
+    compaction_config = create_compaction_config(
+        interval, overlap, summary_model=None, enabled=True
+    )
+    compacted = asyncio.run(run_conversation(turns, compaction_config))
+
+    print(f"turns={turns} interval={interval} overlap={overlap}")
+    print(f"{'turn':>4} {'no compaction':>14} {'compaction':>11}")
+    for turn, (before, after) in enumerate(zip(baseline, compacted), start=1):
+        print(f"{turn:>4} {before:>14} {after:>11}")
+    print(f"{'sum':>4} {sum(baseline):>14} {sum(compacted):>11}")
+    print(f"summaries: {summary_usage['calls']} extra model calls, "
+          f"{summary_usage['prompt_tokens']} prompt tokens")
+
+
+if __name__ == "__main__":
+    main()
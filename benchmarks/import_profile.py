@@ -0,0 +1,85 @@
+"""Where the cold-start import time of the web app goes, from ``-X importtime``.
+
+Imports ``module`` (app by default) in a fresh interpreter ``runs`` times
+and profiles the run with the median total. Self time is attributed to the
+package that owns each module (``google.adk``, ``google.genai``,
+``sqlalchemy``, ... and this project's ``agents`` / ``services``), so the
+report shows which dependencies dominate startup and how much of it the
+project's own modules add. Agent warm-up is switched off so only imports
+are measured; set SESSION_DB_URL=memory to profile without the database
+session backend.
+
+Usage:
+    python benchmarks/import_profile.py [module] [runs] [top]
+"""
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROJECT_PACKAGES = ("agents", "services", "app", "asgi")
+
+
+def profile_import(module: str) -> list[tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) for every module ``module`` imports."""
+    env = {**os.environ, "WARM_UP_AGENTS": "false"}
+    env.setdefault("GOOGLE_API_KEY", "benchmark")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def owner(module: str) -> str:
+    parts = module.split(".")
+    if parts[0] == "google" and len(parts) > 1:
+        return ".".join(parts[:2])
+    return parts[0]
+
+
+def main():
+    module = sys.argv[1] if len(sys.argv) > 1 else "app"
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    top = int(sys.argv[3]) if len(sys.argv) > 3 else 12
+
+    profiles = [profile_import(module) for _ in range(runs)]
+    totals = [sum(self_us for _, self_us, _ in rows) for rows in profiles]
+    rows = profiles[totals.index(sorted(totals)[len(totals) // 2])]
+    total = sum(self_us for _, self_us, _ in rows)
+
+    print(f"import {module}: median {statistics.median(totals) / 1e3:.0f} ms, "
+          f"min {min(totals) / 1e3:.0f} ms over {runs} runs ({len(rows)} modules)")
+
+    by_owner = {}
+    for name, self_us, _ in rows:
+        by_owner[owner(name)] = by_owner.get(owner(name), 0) + self_us
+
+    print("\nself time by package:")
+    for package, self_us in sorted(by_owner.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {package:<28} {self_us / 1e3:8.1f} ms  {100 * self_us / total:5.1f}%")
+
+    project = [row for row in rows if owner(row[0]) in PROJECT_PACKAGES]
+    project_total = sum(self_us for _, self_us, _ in project)
+    print(f"\nproject modules: {project_total / 1e3:.1f} ms self "
+          f"({100 * project_total / total:.1f}%), {len(project)} modules")
+    for name, self_us, cumulative_us in sorted(project, key=lambda row: -row[1])[:top]:
+        print(f"  {name:<44} self {self_us / 1e3:7.1f} ms  cumulative {cumulative_us / 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Check that background jobs sharing one chat session both succeed.
+
+Submits two jobs at once to /api/jobs (Flask) for one session, first on a
+new session and then on the existing one, with sqlite sessions and every
+remote backend faked (see fake_backends.py). Concurrent runs on one ADK
+session fail when creating it or appending events, so the job queue must
+run them one at a time.
+
+Usage:
+    python benchmarks/job_session_check.py
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_pair(client) -> list[tuple[str, str]]:
+    """Submit two jobs at once and wait for both; returns (status, error) pairs."""
+    job_ids = [
+        client.post("/api/jobs", json={"message": f"Hello, job {i}"}).get_json()["job_id"]
+        for i in range(2)
+    ]
+    while True:
+        jobs = [client.get(f"/api/jobs/{job_id}").get_json() for job_id in job_ids]
+        if all(job["status"] in ("succeeded", "failed") for job in jobs):
+            return [(job["status"], job["error"]) for job in jobs]
+        time.sleep(0.05)
+
+
+def main():
+    workdir = Path(tempfile.mkdtemp(prefix="job-session-check-"))
+    os.environ["DESIGN_ARTIFACTS_DIR"] = str(workdir / "artifacts")
+    os.environ["SESSION_DB_URL"] = f"sqlite+aiosqlite:///{workdir / 'sessions.db'}"
+    os.environ["WARM_UP_AGENTS"] = "false"
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+    sys.path.insert(0, str(ROOT))
+    sys.path.insert(0, str(ROOT / "benchmarks"))
+
+    import app
+    from fake_backends import install_fake_backends
+    from services.chat import get_runner
+
+    install_fake_backends(get_runner().agent, 0.2, 0.05, 0.05)
+
+    client = app.app.test_client()
+    ok = True
+    for label in ("new session", "existing session"):
+        results = run_pair(client)
+        passed = all(status == "succeeded" for status, _ in results)
+        ok = ok and passed
+        print(f"{label:>16}: {results}  {'OK' if passed else 'FAILED'}")
+
+    print("OK" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Check PooledMcpToolset against a local MCP server.
+
+Runs a FastMCP server (streamable HTTP, in-process on uvicorn) with one
+search tool, points a PooledMcpToolset at it and checks that:
+
+    reuse        calls made from several event loops share one MCP session
+    tool cache   the tool list is fetched from the server once
+    reconnect    a failed health check drops the session, and the next
+                 call opens a new one once the server is back
+    close        closing shuts the session down without cleanup errors
+
+Exits non-zero when any check fails.
+
+Usage:
+    python benchmarks/mcp_pool_check.py
+"""
+import asyncio
+import io
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+import uvicorn
+from mcp.server.fastmcp import FastMCP
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPConnectionParams
+
+from agents.influencer_search.mcp_pool import PooledMcpToolset
+from web_load_test import free_port
+
+counters = {"list_tools": 0, "search": 0}
+
+
+class CountingMCP(FastMCP):
+    async def list_tools(self):
+        counters["list_tools"] += 1
+        return await super().list_tools()
+
+
+class LocalMcpServer:
+    """A FastMCP server on uvicorn in a background thread; restartable."""
+
+    def __init__(self, port: int):
+        self.port = port
+        self.url = f"http://127.0.0.1:{port}/mcp"
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        mcp = CountingMCP("local-search", host="127.0.0.1", port=self.port)
+
+        @mcp.tool()
+        def search(query: str) -> str:
+            """Search the web."""
+            counters["search"] += 1
+            return f"results for {query}"
+
+        # The pool holds its session's event stream open, so stopping cuts
+        # it off after the grace period; uvicorn logs that as an error.
+        config = uvicorn.Config(
+            mcp.streamable_http_app(), host="127.0.0.1", port=self.port,
+            log_level="critical", timeout_graceful_shutdown=1,
+        )
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+
+    def stop(self):
+        self._server.should_exit = True
+        self._thread.join()
+
+
+async def search_once(toolset: PooledMcpToolset, query: str):
+    """Fetch the tools and call search; returns the session used and the result."""
+    tools = await toolset.get_tools()
+    result = await tools[0].run_async(args={"query": query}, tool_context=None)
+    session = await toolset.run_on_pool(toolset._mcp_session_manager.create_session())
+    return session, result
+
+
+def run_in_new_loop(coro_factory):
+    """Like a Flask request: a fresh event loop on a thread of its own."""
+    box = {}
+    thread = threading.Thread(target=lambda: box.update(value=asyncio.run(coro_factory())))
+    thread.start()
+    thread.join()
+    return box["value"]
+
+
+def check(results: list, name: str, passed: bool, detail: str):
+    results.append(passed)
+    print(f"{name:>10}: {'OK' if passed else 'FAILED'}  {detail}")
+
+
+def main():
+    errlog = io.StringIO()
+    logged = io.StringIO()
+    handler = logging.StreamHandler(logged)
+    handler.setLevel(logging.WARNING)
+    logging.getLogger().addHandler(handler)
+
+    server = LocalMcpServer(free_port())
+    server.start()
+    toolset = PooledMcpToolset(
+        connection_params=StreamableHTTPConnectionParams(url=server.url, timeout=5),
+        health_check_interval=0,
+        errlog=errlog,
+    )
+    results = []
+
+    sessions = [
+        run_in_new_loop(lambda i=i: search_once(toolset, f"query {i}"))[0] for i in range(3)
+    ]
+    check(results, "reuse", len({id(s) for s in sessions}) == 1 and counters["search"] == 3,
+          f"{len({id(s) for s in sessions})} session(s) for 3 loops, {counters['search']} calls")
+    check(results, "tool cache", counters["list_tools"] == 1,
+          f"{counters['list_tools']} list_tools request(s) for 3 get_tools calls")
+
+    server.stop()
+    healthy = run_in_new_loop(toolset.check_health)
+    server.start()
+    session, result = run_in_new_loop(lambda: search_once(toolset, "after restart"))
+    check(results, "reconnect",
+          not healthy and session is not sessions[0] and not result.get("isError")
+          and counters["list_tools"] == 2,
+          f"health check {'passed' if healthy else 'failed'} while down, "
+          f"{'new' if session is not sessions[0] else 'same'} session after restart, "
+          f"{counters['list_tools']} list_tools requests")
+
+    run_in_new_loop(toolset.close)
+    problems = [line for line in (errlog.getvalue() + logged.getvalue()).splitlines()
+                if "cleanup" in line.lower() or "cancel scope" in line.lower()]
+    check(results, "close", not problems, problems[0] if problems else "no cleanup errors")
+    server.stop()
+
+    print("OK" if all(results) else "FAILED")
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Offline load test of the whole app: throughput, latency and server memory.
+
+The server (app.py on a pooled WSGI server, or asgi.py on uvicorn) runs in
+a subprocess with every remote backend replaced by a local fake (see
+fake_backends.py): agent models, the genai image client and the Firecrawl
+MCP toolset. N simulated users then cycle through a fixed mix of requests:
+
+    chat        /api/chat answered by the orchestrator
+    content     /api/chat routed to MarketingExpert -> content_agent
+    design      /api/chat routed to design_agent -> create_image -> save
+    influencer  /api/chat routed to influencer_search_agent -> MCP search
+    artifacts   /api/artifacts
+
+Every chat request starts a new conversation, as the fast router only
+delegates on a conversation's opening turn. The report gives requests/s,
+p50/p95/p99 latency per request kind and the server's resident memory
+(read from /proc, so Linux only) after startup, at its peak and at the end.
+Pass --json to also write the results to a file for comparison across
+commits.
+
+Usage:
+    python benchmarks/offline_load.py [--server flask|asgi|both] [--users 16]
+        [--requests 10] [--llm-latency 0.2] [--image-latency 1.0]
+        [--mcp-latency 0.5] [--threads 8] [--json results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from agents.utils.tracing import latency_percentiles
+from web_load_test import free_port, import_app, prepare_server_environment, run_server, wait_until_up
+
+WORKLOAD = [
+    ("chat", "POST", "/api/chat", "hello there"),
+    ("content", "POST", "/api/chat", "Write an Instagram caption for our coffee launch"),
+    ("design", "POST", "/api/chat", "Design a banner image for our coffee launch"),
+    ("influencer", "POST", "/api/chat", "Find fitness influencers on Instagram for our protein bar"),
+    ("artifacts", "GET", "/api/artifacts", None),
+]
+
+
+def serve(kind: str, port: int, threads: int, llm_latency: float, image_latency: float,
+          mcp_latency: float):
+    prepare_server_environment()
+
+    from fake_backends import install_fake_backends
+
+    import_app(kind)
+    from services.chat import get_runner
+
+    install_fake_backends(get_runner().agent, llm_latency, image_latency, mcp_latency)
+    run_server(kind, port, threads)
+
+
+def read_memory_kb(pid: int) -> dict:
+    """Current (VmRSS) and peak (VmHWM) resident set size of ``pid``."""
+    memory = {}
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "VmHWM"):
+                memory[key] = int(value.split()[0])
+    return memory
+
+
+async def simulate_user(client: httpx.AsyncClient, user: int, requests: int, samples: dict,
+                        errors: dict):
+    for i in range(requests):
+        kind, method, url, message = WORKLOAD[(user + i) % len(WORKLOAD)]
+        if message is not None:
+            await client.post("/api/new-session")
+
+        start = time.perf_counter()
+        try:
+            if message is None:
+                response = await client.request(method, url)
+            else:
+                response = await client.request(method, url, json={"message": message})
+            response.raise_for_status()
+            samples.setdefault(kind, []).append((time.perf_counter() - start) * 1e3)
+        except httpx.HTTPError:
+            errors[kind] = errors.get(kind, 0) + 1
+
+
+async def load(base_url: str, users: int, requests: int) -> dict:
+    samples, errors = {}, {}
+
+    async def run_user(user):
+        async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+            await simulate_user(client, user, requests, samples, errors)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_user(user) for user in range(users)))
+    elapsed = time.perf_counter() - start
+
+    completed = sum(len(latencies) for latencies in samples.values())
+    return {
+        "requests": completed,
+        "errors": sum(errors.values()),
+        "throughput": round(completed / elapsed, 2),
+        "latency_ms": {kind: latency_percentiles(latencies) for kind, latencies in samples.items()},
+        "errors_by_kind": errors,
+    }
+
+
+def benchmark(kind: str, args) -> dict:
+    port = free_port()
+    artifacts_dir = tempfile.mkdtemp(prefix="offline-load-")
+    env = {**os.environ, "DESIGN_ARTIFACTS_DIR": artifacts_dir}
+    server = subprocess.Popen(
+        [sys.executable, __file__, "serve", kind, str(port), str(args.threads),
+         str(args.llm_latency), str(args.image_latency), str(args.mcp_latency)],
+        cwd=ROOT,
+        env=env,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        wait_until_up(base_url)
+        baseline = read_memory_kb(server.pid)
+        result = asyncio.run(load(base_url, args.users, args.requests))
+        final = read_memory_kb(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(artifacts_dir, ignore_errors=True)
+
+    result["rss_mb"] = {
+        "startup": round(baseline["VmRSS"] / 1024, 1),
+        "peak": round(final["VmHWM"] / 1024, 1),
+        "end": round(final["VmRSS"] / 1024, 1),
+    }
+    return result
+
+
+def print_result(kind: str, result: dict):
+    rss = result["rss_mb"]
+    print(f"{kind}: {result['throughput']:.1f} req/s  ({result['requests']} ok, "
+          f"{result['errors']} errors)  RSS startup {rss['startup']} MB, "
+          f"peak {rss['peak']} MB, end {rss['end']} MB")
+    for request_kind, latency in sorted(result["latency_ms"].items()):
+        print(f"  {request_kind:>10}: p50 {latency['p50']:8.1f} ms  p95 {latency['p95']:8.1f} ms  "
+              f"p99 {latency['p99']:8.1f} ms  ({latency['samples']} requests)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--server", choices=["flask", "asgi", "both"], default="both")
+    parser.add_argument("--users", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=10, help="requests per user")
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--image-latency", type=float, default=1.0)
+    parser.add_argument("--mcp-latency", type=float, default=0.5)
+    parser.add_argument("--threads", type=int, default=8, help="Flask worker threads")
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    args = parser.parse_args()
+
+    print(f"users={args.users} requests/user={args.requests} latency: "
+          f"llm={args.llm_latency}s image={args.image_latency}s mcp={args.mcp_latency}s")
+    kinds = ["flask", "asgi"] if args.server == "both" else [args.server]
+    results = {}
+    for kind in kinds:
+        results[kind] = benchmark(kind, args)
+        print_result(kind, results[kind])
+
+    if args.json:
+        args.json.write_text(json.dumps({"settings": vars(args) | {"json": str(args.json)},
+                                         "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        serve(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]),
+              float(sys.argv[5]), float(sys.argv[6]), float(sys.argv[7]))
+    else:
+        main()
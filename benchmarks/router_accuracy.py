@@ -0,0 +1,136 @@
+"""Routing accuracy and latency of the keyword fast-path router.
+
+Each labeled request names the agent the LLM router is expected to pick,
+or None when the request is ambiguous and should fall back to the LLM
+(which asks a clarifying question). Reports, for both routing hops, how
+many requests take the fast path, how many of those go to the right
+agent, and the classifier cost. Time saved is estimated from the LLM
+routing latency passed on the command line.
+
+Usage:
+    python benchmarks/router_accuracy.py [llm_routing_ms]
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from agents.utils.router import marketing_router, orchestrator_router
+
+INFLUENCER = "influencer_search_agent"
+MARKETING = "MarketingExpert"
+PLANNER = "planner_agent"
+CONTENT = "content_agent"
+DESIGN = "design_agent"
+
+ORCHESTRATOR_CASES = [
+    ("Find me fitness influencers on Instagram with 50k+ followers", INFLUENCER),
+    ("Who are the top tech YouTubers I should partner with?", INFLUENCER),
+    ("Search for vegan food bloggers in Berlin", INFLUENCER),
+    ("List beauty creators on TikTok with high engagement rate", INFLUENCER),
+    ("Discover micro-influencers in the gaming niche", INFLUENCER),
+    ("Recommend some travel instagrammers for a collab", INFLUENCER),
+    ("I'm looking for streamers who play indie games", INFLUENCER),
+    ("Shortlist 10 finance creators on LinkedIn", INFLUENCER),
+    ("best parenting influencers in India", INFLUENCER),
+    ("Look up sustainable fashion influencers", INFLUENCER),
+    ("Create a marketing plan for my new SaaS product", MARKETING),
+    ("I need Instagram captions for my coffee brand", MARKETING),
+    ("Design a banner for my product launch", MARKETING),
+    ("I want to grow my brand on social media", MARKETING),
+    ("I need posts and images for my product launch campaign", MARKETING),
+    ("Write a blog article about our new feature", MARKETING),
+    ("Generate a thumbnail for my YouTube video", MARKETING),
+    ("Give me a go-to-market strategy for a fintech app", MARKETING),
+    ("Draft three LinkedIn posts announcing our funding round", MARKETING),
+    ("Make a poster for our summer sale", MARKETING),
+    ("Create a content calendar for next month", MARKETING),
+    ("Write ad copy for a Facebook campaign", MARKETING),
+    ("I want to market my AI product on LinkedIn and Twitter", MARKETING),
+    ("Create an influencer marketing campaign for my skincare line", MARKETING),
+    ("Help me with influencer marketing", None),
+    ("Hi there", None),
+    ("Can you help me?", None),
+    ("What can you do?", None),
+    ("Find creators and write captions for them", None),
+    ("yes please", None),
+]
+
+MARKETING_CASES = [
+    ("Create a marketing plan for my new SaaS product", PLANNER),
+    ("Give me a go-to-market strategy for a fintech app", PLANNER),
+    ("I want to market my AI product on LinkedIn and Twitter", PLANNER),
+    ("Build a growth roadmap for my bakery", PLANNER),
+    ("Create a content calendar for next month", PLANNER),
+    ("I need Instagram captions for my coffee brand", CONTENT),
+    ("Write a blog article about our new feature", CONTENT),
+    ("Draft three LinkedIn posts announcing our funding round", CONTENT),
+    ("Write ad copy for a Facebook campaign", CONTENT),
+    ("Give me 20 hashtags for a yoga studio", CONTENT),
+    ("Write a newsletter email for our subscribers", CONTENT),
+    ("Design a banner for my product launch", DESIGN),
+    ("Generate a thumbnail for my YouTube video", DESIGN),
+    ("Make a poster for our summer sale", DESIGN),
+    ("Create a logo for my coffee shop", DESIGN),
+    ("I need an infographic about our product features", DESIGN),
+    ("I need posts and images for my product launch campaign", None),
+    ("I want to grow my brand on social media", None),
+    ("Help me with my brand", None),
+    ("Do both please", None),
+]
+
+
+def evaluate(router, cases):
+    routed = correct = wrong_fast_path = 0
+    for text, expected in cases:
+        result = router.classify(text)
+        if result is None:
+            continue
+        routed += 1
+        if result[0] == expected:
+            correct += 1
+        else:
+            wrong_fast_path += 1
+            print(f"  misrouted: {text!r} -> {result[0]} (expected {expected})")
+
+    iterations = 2000
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for text, _ in cases:
+            router.classify(text)
+    per_call = (time.perf_counter() - start) / (iterations * len(cases))
+
+    confident = sum(1 for _, expected in cases if expected is not None)
+    return {
+        "cases": len(cases),
+        "routed": routed,
+        "correct": correct,
+        "misrouted": wrong_fast_path,
+        "coverage": routed / confident if confident else 0.0,
+        "precision": correct / routed if routed else 1.0,
+        "classify_us": per_call * 1e6,
+    }
+
+
+def main():
+    llm_routing_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 800.0
+
+    for name, router, cases in (
+        ("orchestrator", orchestrator_router, ORCHESTRATOR_CASES),
+        ("marketing expert", marketing_router, MARKETING_CASES),
+    ):
+        print(f"{name}:")
+        result = evaluate(router, cases)
+        saved = result["routed"] / result["cases"] * llm_routing_ms
+        print(f"  cases:        {result['cases']}")
+        print(f"  fast path:    {result['routed']} ({result['coverage']:.0%} of clear requests)")
+        print(f"  precision:    {result['precision']:.1%} ({result['misrouted']} misrouted)")
+        print(f"  classify:     {result['classify_us']:.1f} us/request")
+        print(f"  saved:        ~{saved:.0f} ms/request at {llm_routing_ms:.0f} ms per LLM routing call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Measure per-request agent setup overhead.
+
+Compares building a Runner for every request (the previous behaviour of
+``run_agent``) against reusing the process-wide runner from services/chat.py, and
+reports how much first-request work ``warm_up_agents`` moves to startup.
+
+Usage:
+    python benchmarks/runner_overhead.py [iterations]
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ["WARM_UP_AGENTS"] = "false"
+
+from google.adk.runners import Runner
+
+import app  # noqa: F401  (loads the agents' .env first)
+from services import chat
+
+
+def time_per_call(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    start = time.perf_counter()
+    chat.warm_up_agents()
+    cold_warm_up = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chat.warm_up_agents()
+    warm_warm_up = time.perf_counter() - start
+
+    runner = chat.get_runner()
+    per_request = time_per_call(
+        lambda: Runner(app=runner.app, session_service=runner.session_service),
+        iterations,
+    )
+    shared = time_per_call(chat.get_runner, iterations)
+
+    print(f"iterations:                  {iterations}")
+    print(f"runner per request:          {per_request * 1e6:10.1f} us/request")
+    print(f"shared runner:               {shared * 1e6:10.1f} us/request")
+    print(f"warm-up (cold, at startup):  {cold_warm_up * 1e3:10.1f} ms")
+    print(f"warm-up (already warm):      {warm_warm_up * 1e3:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Check that a streamed chat turn is recorded as one trace.
+
+Sends a design request (orchestrator -> MarketingExpert -> design_agent ->
+create_image -> save) to /api/chat/stream on both front ends, with every
+remote backend faked (see fake_backends.py), and reads the exported
+OTLP/JSON spans back. Every span of the turn, including the background
+image write, must share one trace id under a single root span.
+
+It then makes one /api/chat run fail on Flask and checks that the failed
+run is exported with its root span and that the next request on that
+thread is still traced (a failed run must not leave its spans current).
+
+Usage:
+    python benchmarks/streamed_trace_check.py
+"""
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MESSAGE = "Design a banner image for our coffee launch"
+FAILING_MESSAGE = "This request makes the fake model fail"
+
+
+def exported_spans(export_path: Path) -> list[dict]:
+    if not export_path.exists():
+        return []
+    return [
+        span
+        for line in export_path.read_text().splitlines()
+        for resource in json.loads(line)["resourceSpans"]
+        for scope in resource["scopeSpans"]
+        for span in scope["spans"]
+    ]
+
+
+def main():
+    workdir = Path(tempfile.mkdtemp(prefix="trace-check-"))
+    export_path = workdir / "traces.jsonl"
+    os.environ["DESIGN_ARTIFACTS_DIR"] = str(workdir / "artifacts")
+    os.environ["TRACE_EXPORT_PATH"] = str(export_path)
+    os.environ["TRACING_ENABLED"] = "true"
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+    os.environ.setdefault("SESSION_DB_URL", "memory")
+    os.environ["WARM_UP_AGENTS"] = "false"
+    sys.path.insert(0, str(ROOT))
+    sys.path.insert(0, str(ROOT / "benchmarks"))
+
+    from starlette.testclient import TestClient
+
+    import app
+    import asgi
+    import fake_llm
+    from agents.design.utils.artifact_utils import wait_for_image_writes
+    from fake_backends import install_fake_backends
+    from services.chat import get_runner
+
+    install_fake_backends(get_runner().agent, 0.01, 0.01, 0.01)
+
+    generate = fake_llm.FakeLlm.generate_content_async
+
+    async def fail_on_request(self, llm_request, stream=False):
+        if FAILING_MESSAGE in str(llm_request.contents[-1]):
+            raise RuntimeError("fake model failure")
+        async for response in generate(self, llm_request, stream):
+            yield response
+
+    fake_llm.FakeLlm.generate_content_async = fail_on_request
+
+    ok = True
+    for kind, client in (("flask", app.app.test_client()), ("asgi", TestClient(asgi.app))):
+        seen = len(exported_spans(export_path))
+        response = client.post("/api/chat/stream", json={"message": MESSAGE})
+        body = response.get_data(as_text=True) if hasattr(response, "get_data") else response.text
+        wait_for_image_writes()
+
+        spans = exported_spans(export_path)[seen:]
+        traces = {span["traceId"] for span in spans}
+        roots = [span["name"] for span in spans if "parentSpanId" not in span]
+        stages = {span["name"].split(" ")[0] for span in spans}
+        passed = (
+            response.status_code == 200
+            and "event: done" in body
+            and len(traces) == 1
+            and len(roots) == 1
+            and {"run", "agent", "model", "tool", "write_image"} <= stages
+        )
+        ok = ok and passed
+        print(f"{kind:>5}: {len(spans)} spans in {len(traces)} trace(s), roots {roots}  "
+              f"{'OK' if passed else 'FAILED'}")
+
+    client = app.app.test_client()
+    for message, expected_status in ((FAILING_MESSAGE, 500), ("Hello", 200)):
+        seen = len(exported_spans(export_path))
+        with client.session_transaction() as session:
+            session.clear()
+        response = client.post("/api/chat", json={"message": message})
+        roots = [
+            span["name"] for span in exported_spans(export_path)[seen:]
+            if "parentSpanId" not in span
+        ]
+        passed = response.status_code == expected_status and roots == ["run brand_boost_ai"]
+        ok = ok and passed
+        print(f"{'failed run' if expected_status == 500 else 'next run':>10}: "
+              f"HTTP {response.status_code}, roots {roots}  {'OK' if passed else 'FAILED'}")
+
+    print("OK" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Concurrent /api/chat throughput: Flask (app.py) versus ASGI (asgi.py).
+
+Each server runs in its own subprocess with every agent backed by a fake
+model that sleeps for the given latency, so the numbers reflect the web
+layer and agent plumbing rather than Gemini. Flask is served by a WSGI
+server with a fixed thread pool (like gunicorn's gthread workers); the
+ASGI app runs on uvicorn's single event loop.
+
+Usage:
+    python benchmarks/web_load_test.py [users] [requests_per_user] [latency_s] [flask_threads]
+"""
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def serve(kind: str, port: int, latency: float, threads: int):
+    prepare_server_environment()
+
+    from fake_llm import install_fake_llm
+
+    import_app(kind)
+    from services.chat import get_runner
+
+    install_fake_llm(get_runner().agent, latency)
+    run_server(kind, port, threads)
+
+
+def prepare_server_environment():
+    sys.path.insert(0, str(ROOT))
+    sys.path.insert(0, str(ROOT / "benchmarks"))
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+    os.environ.setdefault("SESSION_DB_URL", "memory")
+    os.environ["WARM_UP_AGENTS"] = "false"
+
+
+def import_app(kind: str):
+    """The Flask or Starlette application object of app.py / asgi.py."""
+    if kind == "flask":
+        import app
+        return app.app
+
+    import asgi
+    return asgi.app
+
+
+def run_server(kind: str, port: int, threads: int):
+    """Serve Flask from a fixed WSGI thread pool, or the ASGI app on uvicorn."""
+    if kind == "flask":
+        from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+        class PooledWSGIServer(BaseWSGIServer):
+            pool = ThreadPoolExecutor(max_workers=threads)
+
+            def process_request(self, request, client_address):
+                self.pool.submit(self._handle, request, client_address)
+
+            def _handle(self, request, client_address):
+                try:
+                    self.finish_request(request, client_address)
+                except Exception:
+                    self.handle_error(request, client_address)
+                finally:
+                    self.shutdown_request(request)
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_request(self, *args, **kwargs):
+                pass
+
+        PooledWSGIServer("127.0.0.1", port, import_app(kind), handler=QuietHandler).serve_forever()
+    else:
+        import uvicorn
+
+        uvicorn.run(import_app(kind), host="127.0.0.1", port=port, log_level="warning")
+
+
+async def simulate_user(base_url: str, requests: int, latencies: list, errors: list):
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        for _ in range(requests):
+            start = time.perf_counter()
+            try:
+                response = await client.post("/api/chat", json={"message": "hello there"})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                errors.append(e)
+
+
+async def load(base_url: str, users: int, requests_per_user: int) -> dict:
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        simulate_user(base_url, requests_per_user, latencies, errors)
+        for _ in range(users)
+    ))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "throughput": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0,
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(base_url: str, timeout: float = 60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.get(f"{base_url}/api/metrics", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    requests_per_user = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.5
+    threads = int(sys.argv[4]) if len(sys.argv) > 4 else 8
+
+    print(f"users={users} requests/user={requests_per_user} "
+          f"model latency={latency}s flask threads={threads}")
+    for kind in ("flask", "asgi"):
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, __file__, "serve", kind, str(port), str(latency), str(threads)],
+            cwd=ROOT,
+        )
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            wait_until_up(base_url)
+            result = asyncio.run(load(base_url, users, requests_per_user))
+        finally:
+            server.terminate()
+            server.wait()
+
+        print(f"{kind:>5}: {result['throughput']:7.1f} req/s  "
+              f"p50 {result['p50'] * 1e3:7.0f} ms  p95 {result['p95'] * 1e3:7.0f} ms  "
+              f"({result['requests']} ok, {result['errors']} errors)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        serve(sys.argv[2], int(sys.argv[3]), float(sys.argv[4]), int(sys.argv[5]))
+    else:
+        main()
@@ -0,0 +1,463 @@
+"""Agent runtime shared by the Flask (app.py) and ASGI (asgi.py) front ends.
+
+Import this module only after the agents' .env has been loaded; the
+agents and services read their settings at import time. ADK, genai and
+the agent graph are only imported by the first ``get_runner()`` call (the
+background warm-up or the first chat), so a worker starts serving in a
+fraction of a second and before any of them exist.
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import zlib
+
+from agents.design.utils.artifact_index import artifact_index
+from agents.design.utils.artifact_utils import (
+    PRODUCED_ARTIFACTS_KEY,
+    cached_image_bytes,
+    image_cache,
+    pending_image_writes,
+)
+from agents.utils.tracing import TRACE_EXPORT_PATH, TRACING_ENABLED, tracer
+from services.jobs import FAILED, create_job_queue
+from services.session_store import (
+    HISTORY_COMPACTION_ENABLED,
+    HISTORY_COMPACTION_INTERVAL,
+    HISTORY_COMPACTION_OVERLAP,
+)
+
+logger = logging.getLogger(__name__)
+
+APP_NAME = "brand_boost_ai"
+
+_runner = None
+_runner_lock = threading.Lock()
+
+JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", "0.5"))
+# Longest a Flask job event stream stays open before the client reconnects.
+JOB_STREAM_MAX_SECONDS = float(os.environ.get("JOB_STREAM_MAX_SECONDS", "60"))
+
+ARTIFACTS_PAGE_SIZE = int(os.environ.get("ARTIFACTS_PAGE_SIZE", "50"))
+ARTIFACTS_MAX_PAGE_SIZE = 200
+
+# Version files and renditions never change once written.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+ERROR_MESSAGE = "We're experiencing technical difficulties at the moment. Please try again in a few moments."
+
+
+def get_runner():
+    """The shared Runner, building the agent graph on first use.
+
+    Importing ``agents.agent`` constructs every agent and imports all tool
+    modules and prompts. ADK needs the complete tree (transfer targets,
+    AgentTool declarations) as soon as it runs, so it is built in one go,
+    together with the session backend and the plugins.
+    """
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            from google.adk.apps import App
+            from google.adk.runners import Runner
+
+            from agents.agent import root_agent
+            from services.prompt_metrics import prompt_metrics
+            from services.session_store import create_compaction_config, create_session_service
+            from services.tracing import tracing
+
+            agent_app = App(
+                name=APP_NAME,
+                root_agent=root_agent,
+                plugins=[prompt_metrics, tracing] if TRACING_ENABLED else [prompt_metrics],
+                events_compaction_config=create_compaction_config(),
+            )
+            _runner = Runner(app=agent_app, session_service=create_session_service())
+        return _runner
+
+
+async def load_runner():
+    """``get_runner`` for coroutines: a first build runs on a worker thread.
+
+    Building the graph and preparing the session database block for
+    seconds, which on the ASGI server's single loop would stall every
+    other request.
+    """
+    if _runner is not None:
+        return _runner
+    return await asyncio.to_thread(get_runner)
+
+
+def parse_state_delta(data):
+    """Session state changes requested alongside the message.
+
+    ``bypass_cache`` switches the response cache off (or back on) for the
+    rest of the session.
+    """
+    if "bypass_cache" not in data:
+        return None
+    from agents.utils.response_cache import RESPONSE_CACHE_BYPASS_KEY
+
+    return {RESPONSE_CACHE_BYPASS_KEY: bool(data["bypass_cache"])}
+
+
+async def ensure_session_exists(session_id, user_id):
+    """Fetch the session, creating it on first use."""
+    session_service = (await load_runner()).session_service
+    from google.adk.errors.already_exists_error import AlreadyExistsError
+
+    existing_session = None
+    try:
+        existing_session = await session_service.get_session(
+            app_name=APP_NAME,
+            user_id=user_id,
+            session_id=session_id
+        )
+    except Exception:
+        pass
+
+    if existing_session:
+        return existing_session
+
+    try:
+        return await session_service.create_session(
+            app_name=APP_NAME,
+            user_id=user_id,
+            session_id=session_id
+        )
+    except AlreadyExistsError:
+        # A concurrent request created it between the lookup and here.
+        return await session_service.get_session(
+            app_name=APP_NAME,
+            user_id=user_id,
+            session_id=session_id
+        )
+
+
+async def stream_agent(session_id, user_id, user_message, state_delta=None, run_config=None):
+    # Loads ADK and genai first, so the imports below are cheap.
+    runner = await load_runner()
+    from google.genai.types import Content, Part
+
+    message_content = Content(parts=[Part(text=user_message)], role="user")
+    # Each turn starts with no produced images (see record_produced_artifact).
+    state_delta = {PRODUCED_ARTIFACTS_KEY: {}, **(state_delta or {})}
+
+    with tracer.scope():
+        async for event in runner.run_async(
+            session_id=session_id,
+            user_id=user_id,
+            new_message=message_content,
+            state_delta=state_delta,
+            run_config=run_config,
+        ):
+            yield event
+
+
+async def run_chat(session_id, user_id, user_message, state_delta=None):
+    await ensure_session_exists(session_id, user_id)
+
+    result = await run_agent(session_id, user_id, user_message, state_delta)
+    return extract_final_response(result), extract_image_info(result)
+
+
+async def run_chat_job(session_id, user_id, user_message, state_delta=None):
+    """Background job body: one chat turn, returning the /api/chat payload."""
+    response_text, images = await run_chat(session_id, user_id, user_message, state_delta)
+    if not response_text or not response_text.strip():
+        raise RuntimeError("Agent returned empty response")
+
+    return {
+        "status": "success",
+        "response": response_text,
+        "images": images,
+    }
+
+
+async def run_agent(session_id, user_id, user_message, state_delta=None):
+    events = []
+    async for event in stream_agent(session_id, user_id, user_message, state_delta):
+        events.append(event)
+
+    return events
+
+
+async def stream_chat_events(session_id, user_id, user_message, state_delta=None):
+    """Run the agent in SSE mode and yield encoded stream messages.
+
+    Emits ``text`` deltas, tagged with the authoring agent, as the model
+    produces them, ``tool_start`` / ``tool_end`` around every tool call,
+    ``images`` whenever new design artifacts appear, and a closing ``done``
+    (or ``error``) message that mirrors the payload of the non-streaming
+    /api/chat endpoint.
+    """
+    try:
+        from google.adk.agents.run_config import RunConfig, StreamingMode
+
+        await ensure_session_exists(session_id, user_id)
+
+        run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+        response_text = ""
+        image_events = []
+        reported = set()
+
+        async for event in stream_agent(
+            session_id, user_id, user_message, state_delta, run_config
+        ):
+            for call in event.get_function_calls():
+                yield format_sse("tool_start", {"name": call.name})
+
+            function_responses = event.get_function_responses()
+            for function_response in function_responses:
+                yield format_sse("tool_end", {"name": function_response.name})
+
+            new_images = {
+                key: entry for key, entry in produced_artifacts(event).items()
+                if key not in reported
+            }
+            if new_images:
+                reported.update(new_images)
+                image_events.append(event)
+                yield format_sse("images", {"images": describe_produced(new_images.values())})
+
+            text = extract_event_text(event)
+            if not text:
+                continue
+
+            if event.partial:
+                yield format_sse("text", {"delta": text, "author": event.author})
+            elif event.is_final_response() and not response_text:
+                response_text = text
+
+        if not response_text.strip():
+            logger.warning("Agent returned empty response")
+            yield format_sse("error", {
+                "status": "error",
+                "response": ERROR_MESSAGE,
+            })
+            return
+
+        yield format_sse("done", {
+            "status": "success",
+            "response": response_text,
+            "images": extract_image_info(image_events),
+        })
+
+    except Exception:
+        logger.exception("Chat streaming error")
+        yield format_sse("error", {
+            "status": "error",
+            "response": ERROR_MESSAGE,
+        })
+
+
+def format_sse(event_type, data):
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+def extract_event_text(event):
+    if not event.content or not event.content.parts:
+        return ""
+    return "".join(
+        part.text for part in event.content.parts
+        if part.text and not part.thought
+    )
+
+
+def extract_final_response(result):
+    for event in result:
+        if event.is_final_response() and event.content and event.content.parts:
+            return event.content.parts[0].text
+    return ""
+
+
+def produced_artifacts(event) -> dict:
+    """The turn's produced versions recorded on ``event``, keyed "name:vN"."""
+    return (event.actions.state_delta or {}).get(PRODUCED_ARTIFACTS_KEY) or {}
+
+
+def extract_image_info(events) -> list:
+    """Images produced by the design tools during the given run events."""
+    produced = {}
+    for event in events:
+        produced.update(produced_artifacts(event))
+    return describe_produced(produced.values())
+
+
+def describe_produced(entries) -> list:
+    produced = {}
+    for entry in entries:
+        produced.setdefault(entry["name"], set()).add(entry["version"])
+
+    return [
+        describe_artifact(name, sorted(versions), newest_first=True)
+        for name, versions in produced.items()
+    ]
+
+
+def describe_artifact(name, versions, newest_first=False):
+    entries = [
+        {
+            "version": version,
+            "url": f"/artifacts/{name}/v{version}.png",
+            "thumbnail": f"/artifacts/{name}/v{version}.png?size=thumb",
+        }
+        for version in versions
+    ]
+    if newest_first:
+        entries.reverse()
+
+    latest = f"/artifacts/{name}/v{max(versions)}.png"
+    return {
+        "name": name,
+        "versions": entries,
+        "latest": latest,
+        "thumbnail": f"{latest}?size=thumb",
+    }
+
+
+def list_artifacts_page(cursor=0, offset=0, limit=None):
+    """One page of the assets changed since ``cursor``, most recent first.
+
+    ``next_offset`` is None on the last page; ``cursor`` is the value to
+    pass as ``since`` on the next poll for changes.
+    """
+    offset, limit = page_bounds(offset, limit)
+    change_counter = artifact_index.change_counter
+    names = artifact_index.changed_since(cursor)
+    page = names[offset:offset + limit]
+
+    return {
+        "artifacts": [
+            describe_artifact(name, artifact_index.versions(name)) for name in page
+        ],
+        "cursor": change_counter,
+        "total": len(names),
+        "next_offset": offset + limit if offset + limit < len(names) else None,
+    }
+
+
+def cached_artifact(filename):
+    """``(bytes, etag)`` of a recently saved version held in memory, else None.
+
+    Callers fall back to the file on disk, which is complete by the time
+    this returns None.
+    """
+    data = cached_image_bytes(filename)
+    if data is None:
+        return None
+    return data, f"image-{zlib.crc32(data):08x}-{len(data):x}"
+
+
+def artifacts_etag(cursor=0, offset=0, limit=None):
+    """ETag of the ``list_artifacts_page`` result, known without building it.
+
+    A listing only changes when a version is recorded or removed, which bumps
+    the index's change counter.
+    """
+    offset, limit = page_bounds(offset, limit)
+    return f"artifacts-{artifact_index.change_counter}-{cursor}-{offset}-{limit}"
+
+
+def page_bounds(offset, limit):
+    limit = min(max(limit or ARTIFACTS_PAGE_SIZE, 1), ARTIFACTS_MAX_PAGE_SIZE)
+    return max(offset, 0), limit
+
+
+def describe_job(job):
+    failed = job["status"] == FAILED
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "result": job["result"],
+        "error": ERROR_MESSAGE if failed else None,
+    }
+
+
+def collect_metrics():
+    """Prompt token usage, per-stage latency, cache and routing counters."""
+    from agents.influencer_search.agent import search_result_cache
+    from agents.utils.response_cache import RESPONSE_CACHE_ENABLED, response_cache
+    from agents.utils.router import marketing_router, orchestrator_router
+    from services.prompt_metrics import prompt_metrics
+
+    compaction_enabled = HISTORY_COMPACTION_ENABLED and HISTORY_COMPACTION_INTERVAL > 0
+    return {
+        "prompt_tokens": prompt_metrics.snapshot(),
+        "latency_ms": {
+            "enabled": TRACING_ENABLED,
+            "export_path": TRACE_EXPORT_PATH,
+            "stages": tracer.stats(),
+        },
+        "history_compaction": {
+            "enabled": compaction_enabled,
+            "interval": HISTORY_COMPACTION_INTERVAL if compaction_enabled else None,
+            "overlap": HISTORY_COMPACTION_OVERLAP if compaction_enabled else None,
+        },
+        "response_cache": {
+            "enabled": RESPONSE_CACHE_ENABLED,
+            **response_cache.stats(),
+        },
+        "search_result_cache": search_result_cache.stats(),
+        "image_cache": {
+            **image_cache.stats(),
+            "pending_writes": pending_image_writes(),
+        },
+        "fast_router": {
+            "orchestrator": orchestrator_router.stats(),
+            "marketing_expert": marketing_router.stats(),
+        },
+    }
+
+
+def start_warm_up():
+    """Run ``warm_up_agents`` on a background thread, so startup never waits for it."""
+    threading.Thread(target=_warm_up_quietly, name="agent-warm-up", daemon=True).start()
+
+
+def _warm_up_quietly():
+    try:
+        warm_up_agents()
+    except Exception:
+        logger.exception("Agent warm-up failed")
+
+
+def warm_up_agents(agent=None, visited=None):
+    """Resolve tool declarations for the whole agent tree once at startup.
+
+    Walks sub-agents and AgentTool-wrapped agents so the lazy imports and
+    schema building behind the first model request happen before the first
+    user does. Pooled MCP toolsets start connecting in the background.
+    """
+    from google.adk.agents import LlmAgent
+    from google.adk.tools import AgentTool, BaseTool
+
+    from agents.influencer_search.mcp_pool import PooledMcpToolset
+
+    agent = get_runner().agent if agent is None else agent
+    visited = set() if visited is None else visited
+    if agent.name in visited:
+        return
+    visited.add(agent.name)
+
+    if isinstance(agent, LlmAgent):
+        for tool in agent.tools:
+            if isinstance(tool, AgentTool):
+                warm_up_agents(tool.agent, visited)
+            if isinstance(tool, PooledMcpToolset):
+                tool.prefetch_tools()
+            if not isinstance(tool, BaseTool):
+                continue
+            try:
+                tool._get_declaration()
+            except Exception:
+                logger.warning("Could not warm up tool %s", tool.name)
+
+    for sub_agent in agent.sub_agents:
+        warm_up_agents(sub_agent, visited)
+
+
+job_queue = create_job_queue(run_chat_job)
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from google.adk.sessions import Session
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.adk.sessions.database_session_service import DatabaseSessionService
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+
+from services.session_store import SESSION_COMPACTION_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+class PersistentSessionService(DatabaseSessionService):
+    """Database-backed sessions with TTL expiry and bounded event history.
+
+    Any SQLAlchemy async URL works (sqlite+aiosqlite locally,
+    postgresql+asyncpg when several workers or nodes share sessions).
+    Sessions idle for longer than ``session_ttl`` are treated as missing and
+    removed; ``compact`` additionally deletes expired sessions in bulk and
+    trims each session to roughly its ``max_events`` most recent events,
+    always cutting at an invocation boundary so tool calls keep their
+    responses.
+    """
+
+    def __init__(self, db_url: str, session_ttl: float, max_events: int, **kwargs):
+        super().__init__(db_url, **kwargs)
+        self.session_ttl = session_ttl
+        self.max_events = max_events
+        self._compaction_thread: Optional[threading.Thread] = None
+
+    def prepare(self):
+        """Check the schema and create the tables before the first request.
+
+        ADK guards this step with asyncio locks, which bind to the first
+        event loop that waits on them. Flask runs every request on a loop of
+        its own, so concurrent first requests would fail or hang on them;
+        done up front, every later call takes the lock-free path.
+        """
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pool.submit(asyncio.run, self._prepare_tables()).result()
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        try:
+            return await super().create_session(
+                app_name=app_name, user_id=user_id, state=state, session_id=session_id
+            )
+        except IntegrityError:
+            # The first sessions of an app (or user) created concurrently race
+            # to insert its shared state row; the loser retries against it.
+            return await super().create_session(
+                app_name=app_name, user_id=user_id, state=state, session_id=session_id
+            )
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        session = await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        if session is not None and time.time() - session.last_update_time > self.session_ttl:
+            await self.delete_session(
+                app_name=app_name, user_id=user_id, session_id=session_id
+            )
+            return None
+        return session
+
+    async def compact(self) -> dict:
+        """Delete expired sessions and trim overlong event histories."""
+        await self._prepare_tables()
+        schema = self._get_schema_classes()
+        StorageSession, StorageEvent = schema.StorageSession, schema.StorageEvent
+
+        # ADK writes update_time as naive UTC on sqlite (which has no time
+        # zones) and as naive local time elsewhere; compare like with like.
+        cutoff_ts = time.time() - self.session_ttl
+        if self.db_engine.dialect.name == "sqlite":
+            cutoff = datetime.fromtimestamp(cutoff_ts, timezone.utc).replace(tzinfo=None)
+        else:
+            cutoff = datetime.fromtimestamp(cutoff_ts)
+        pruned_events = 0
+
+        async with self.database_session_factory() as sql_session:
+            expired = await sql_session.execute(
+                delete(StorageSession).where(StorageSession.update_time < cutoff)
+            )
+
+            session_keys = (StorageEvent.app_name, StorageEvent.user_id, StorageEvent.session_id)
+            overfull = await sql_session.execute(
+                select(*session_keys)
+                .group_by(*session_keys)
+                .having(func.count() > self.max_events)
+            )
+            for app_name, user_id, session_id in overfull.all():
+                in_session = (
+                    (StorageEvent.app_name == app_name)
+                    & (StorageEvent.user_id == user_id)
+                    & (StorageEvent.session_id == session_id)
+                )
+                oldest_kept = (await sql_session.execute(
+                    select(StorageEvent.timestamp, StorageEvent.invocation_id)
+                    .where(in_session)
+                    .order_by(StorageEvent.timestamp.desc())
+                    .offset(self.max_events - 1)
+                    .limit(1)
+                )).first()
+                result = await sql_session.execute(
+                    delete(StorageEvent).where(
+                        in_session
+                        & (StorageEvent.timestamp < oldest_kept.timestamp)
+                        & (StorageEvent.invocation_id != oldest_kept.invocation_id)
+                    )
+                )
+                pruned_events += result.rowcount
+
+            await sql_session.commit()
+
+        return {"expired_sessions": expired.rowcount, "pruned_events": pruned_events}
+
+    def start_compaction(self, interval: float = SESSION_COMPACTION_INTERVAL):
+        """Run ``compact`` every ``interval`` seconds on a background thread."""
+        if self._compaction_thread is not None or interval <= 0:
+            return
+        self._compaction_thread = threading.Thread(
+            target=asyncio.run,
+            args=(self._compaction_loop(interval),),
+            name="session-compaction",
+            daemon=True,
+        )
+        self._compaction_thread.start()
+
+    async def _compaction_loop(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                logger.info("Session compaction: %s", await self.compact())
+            except Exception:
+                logger.exception("Session compaction failed")
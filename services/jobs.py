@@ -0,0 +1,223 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_MAX_PER_USER = int(os.getenv("JOB_MAX_PER_USER", "2"))
+JOB_TIMEOUT = float(os.getenv("JOB_TIMEOUT", "900"))
+JOB_RETENTION = float(os.getenv("JOB_RETENTION", str(24 * 3600)))
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED = (SUCCEEDED, FAILED)
+
+
+class JobLimitExceeded(Exception):
+    """The user already has the maximum number of unfinished jobs."""
+
+
+class JobQueue:
+    """Run chat requests in the background and keep their outcome for polling.
+
+    Jobs execute on a thread pool, each on its own event loop, so a slow
+    agent run never holds an HTTP request open. Job records live in memory
+    or, when ``path`` is given, in a sqlite database that every worker
+    process can read. A job that has not finished ``timeout`` seconds after
+    submission is cancelled (or, if its process died, reported) as failed.
+
+    With ``serialize_by`` set to a handler argument (e.g. ``session_id``),
+    jobs sharing that argument run one at a time in submission order; the
+    later ones wait in the queue without holding a worker.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[..., Awaitable[Any]],
+        workers: int,
+        max_per_user: int,
+        timeout: float,
+        retention: float,
+        path: Optional[Path] = None,
+        serialize_by: Optional[str] = None,
+    ):
+        self.handler = handler
+        self.serialize_by = serialize_by
+        self.max_per_user = max_per_user
+        self.timeout = timeout
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._jobs: dict[str, dict] = {}
+        self._waiting: dict[Any, deque] = {}
+        self._db = None
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, user_id TEXT NOT NULL, status TEXT NOT NULL, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+                "result TEXT, error TEXT)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS jobs_user ON jobs (user_id, status)")
+            self._db.commit()
+
+    def submit(self, user_id: str, /, **kwargs) -> dict:
+        """Queue ``handler(**kwargs)`` for ``user_id`` and return the new job."""
+        now = time.time()
+        job = {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "status": QUEUED,
+            "created_at": now,
+            "updated_at": now,
+            "result": None,
+            "error": None,
+        }
+        with self._lock:
+            self._purge(now)
+            if self._active_count(user_id, now) >= self.max_per_user:
+                raise JobLimitExceeded(user_id)
+            self._save(job)
+            if self.serialize_by is None:
+                start = True
+            else:
+                key = kwargs.get(self.serialize_by)
+                waiting = self._waiting.setdefault(key, deque())
+                waiting.append((job, kwargs))
+                start = len(waiting) == 1
+
+        if self.serialize_by is None:
+            self._executor.submit(self._run, job, kwargs)
+        elif start:
+            self._executor.submit(self._run_in_turn, key)
+        return job
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._load(job_id)
+        if job is not None and job["status"] not in FINISHED and self._expired(job, time.time()):
+            job = {**job, "status": FAILED, "error": "timed out"}
+        return job
+
+    def _run_in_turn(self, key):
+        """Run the jobs waiting on ``key`` one after another."""
+        while True:
+            with self._lock:
+                job, kwargs = self._waiting[key][0]
+            self._run(job, kwargs)
+            with self._lock:
+                waiting = self._waiting[key]
+                waiting.popleft()
+                if not waiting:
+                    del self._waiting[key]
+                    return
+
+    def _run(self, job: dict, kwargs: dict):
+        self._update(job, status=RUNNING)
+        remaining = job["created_at"] + self.timeout - time.time()
+        try:
+            if remaining <= 0:
+                raise asyncio.TimeoutError
+            result = asyncio.run(asyncio.wait_for(self.handler(**kwargs), remaining))
+        except asyncio.TimeoutError:
+            logger.warning("Job %s timed out", job["id"])
+            self._update(job, status=FAILED, error="timed out")
+        except Exception as e:
+            logger.exception("Job %s failed", job["id"])
+            self._update(job, status=FAILED, error=str(e) or type(e).__name__)
+        else:
+            self._update(job, status=SUCCEEDED, result=result)
+
+    def _update(self, job: dict, **changes):
+        job.update(changes, updated_at=time.time())
+        with self._lock:
+            self._save(job)
+
+    def _expired(self, job: dict, now: float) -> bool:
+        return now - job["created_at"] > self.timeout
+
+    def _active_count(self, user_id: str, now: float) -> int:
+        if self._db:
+            rows = self._db.execute(
+                "SELECT created_at FROM jobs WHERE user_id = ? AND status IN (?, ?)",
+                (user_id, QUEUED, RUNNING),
+            ).fetchall()
+            return sum(1 for (created_at,) in rows if now - created_at <= self.timeout)
+        return sum(
+            1 for job in self._jobs.values()
+            if job["user_id"] == user_id
+            and job["status"] not in FINISHED
+            and not self._expired(job, now)
+        )
+
+    def _save(self, job: dict):
+        if not self._db:
+            self._jobs[job["id"]] = dict(job)
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                job["id"], job["user_id"], job["status"], job["created_at"],
+                job["updated_at"], json.dumps(job["result"]), job["error"],
+            ),
+        )
+        self._db.commit()
+
+    def _load(self, job_id: str) -> Optional[dict]:
+        if not self._db:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+        row = self._db.execute(
+            "SELECT id, user_id, status, created_at, updated_at, result, error "
+            "FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        keys = ("id", "user_id", "status", "created_at", "updated_at", "result", "error")
+        job = dict(zip(keys, row))
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def _purge(self, now: float):
+        cutoff = now - self.retention
+        if self._db:
+            self._db.execute(
+                "DELETE FROM jobs WHERE updated_at < ? AND created_at < ?",
+                (cutoff, now - self.timeout),
+            )
+            self._db.commit()
+            return
+        for job_id in [
+            job_id for job_id, job in self._jobs.items()
+            if job["updated_at"] < cutoff and (job["status"] in FINISHED or self._expired(job, now))
+        ]:
+            del self._jobs[job_id]
+
+
+def create_job_queue(handler: Callable[..., Awaitable[Any]]) -> JobQueue:
+    return JobQueue(
+        handler,
+        workers=JOB_WORKERS,
+        max_per_user=JOB_MAX_PER_USER,
+        timeout=JOB_TIMEOUT,
+        retention=JOB_RETENTION,
+        path=JOB_STORE_PATH or None,
+        # Concurrent runs on one ADK session conflict when appending events.
+        serialize_by="session_id",
+    )
@@ -0,0 +1,108 @@
+import contextvars
+import os
+import threading
+from collections import deque
+from typing import Any, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models import LlmResponse
+from google.adk.plugins import BasePlugin
+from google.adk.tools import BaseTool, ToolContext
+
+from agents.utils.tracing import tracer
+
+PROMPT_METRICS_WINDOW = int(os.getenv("PROMPT_METRICS_WINDOW", "200"))
+
+# Prompt tokens of the turn running in this context. Nested AgentTool runs
+# inherit the context, so their model calls add to the outer turn.
+_turn_tokens: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar(
+    "turn_tokens", default=None
+)
+
+
+class PromptTokenMetrics(BasePlugin):
+    """Record prompt tokens per model call (by agent) and per turn (by app).
+
+    A turn is one top-level runner invocation, i.e. one chat request.
+    Plugins are handed down to AgentTool runners, which reuse the app name,
+    so a run started inside a tool call is part of the outer turn: its model
+    calls count towards that turn, not as a turn of their own. Only the most
+    recent ``window`` samples are kept for each key.
+    """
+
+    def __init__(self, window: int = PROMPT_METRICS_WINDOW):
+        super().__init__(name="prompt_token_metrics")
+        self.window = window
+        self._lock = threading.Lock()
+        self._calls: dict[str, deque] = {}
+        self._turns: dict[str, deque] = {}
+
+    async def before_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        if not tracer.in_tool():
+            _turn_tokens.set([0])
+
+    async def before_tool_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext
+    ) -> None:
+        tracer.enter_tool(tool_context.function_call_id)
+
+    async def after_tool_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext, result: Any
+    ) -> None:
+        tracer.exit_tool(tool_context.function_call_id)
+
+    async def on_tool_error_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext, error: Exception
+    ) -> None:
+        tracer.exit_tool(tool_context.function_call_id)
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        usage = llm_response.usage_metadata
+        # Streamed partial chunks are followed by an aggregated response.
+        if llm_response.partial or not usage or not usage.prompt_token_count:
+            return None
+
+        turn = _turn_tokens.get()
+        with self._lock:
+            self._sample(self._calls, callback_context.agent_name, usage.prompt_token_count)
+            if turn is not None:
+                turn[0] += usage.prompt_token_count
+        return None
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        turn = _turn_tokens.get()
+        if tracer.in_tool() or turn is None:
+            return
+        with self._lock:
+            if turn[0]:
+                self._sample(self._turns, invocation_context.app_name, turn[0])
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "per_call": {
+                    agent: summarize(samples) for agent, samples in sorted(self._calls.items())
+                },
+                "per_turn": {
+                    app: summarize(samples) for app, samples in sorted(self._turns.items())
+                },
+            }
+
+    def _sample(self, samples: dict[str, deque], key: str, value: int):
+        samples.setdefault(key, deque(maxlen=self.window)).append(value)
+
+
+def summarize(samples) -> dict:
+    samples = list(samples)
+    return {
+        "samples": len(samples),
+        "last": samples[-1],
+        "mean": round(sum(samples) / len(samples), 1),
+        "max": max(samples),
+    }
+
+
+prompt_metrics = PromptTokenMetrics()
@@ -0,0 +1,83 @@
+import os
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from google.adk.apps.app import EventsCompactionConfig
+    from google.adk.sessions import BaseSessionService
+
+SESSION_DB_URL = os.getenv("SESSION_DB_URL", "sqlite+aiosqlite:///sessions.db")
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", str(7 * 24 * 3600)))
+SESSION_MAX_EVENTS = int(os.getenv("SESSION_MAX_EVENTS", "200"))
+SESSION_COMPACTION_INTERVAL = float(os.getenv("SESSION_COMPACTION_INTERVAL", "600"))
+
+# History compaction is opt-in: every summary is an extra model call
+# (billed tokens and latency on the turn that triggers it), and it relies
+# on ADK's experimental EventsCompactionConfig, which warns when created.
+# Turn it on when long conversations make per-turn prompts too large.
+HISTORY_COMPACTION_ENABLED = os.getenv("HISTORY_COMPACTION_ENABLED", "false").lower() == "true"
+HISTORY_COMPACTION_INTERVAL = int(os.getenv("HISTORY_COMPACTION_INTERVAL", "4"))
+HISTORY_COMPACTION_OVERLAP = int(os.getenv("HISTORY_COMPACTION_OVERLAP", "1"))
+HISTORY_SUMMARY_MODEL = os.getenv("HISTORY_SUMMARY_MODEL")
+
+
+def create_session_service(db_url: str = SESSION_DB_URL) -> "BaseSessionService":
+    """Build the session backend configured by ``SESSION_DB_URL``.
+
+    ``memory`` selects the non-persistent InMemorySessionService.
+    """
+    if db_url == "memory":
+        from google.adk.sessions import InMemorySessionService
+
+        return InMemorySessionService()
+
+    # Imported here: SQLAlchemy and ADK's database schemas add about 0.4 s
+    # to startup, which the in-memory backend does not need.
+    from sqlalchemy.pool import NullPool
+
+    from services.database_sessions import PersistentSessionService
+
+    # Flask runs every async view on its own event loop, so pooled async
+    # connections cannot be reused between requests.
+    service = PersistentSessionService(
+        db_url,
+        session_ttl=SESSION_TTL_SECONDS,
+        max_events=SESSION_MAX_EVENTS,
+        poolclass=NullPool,
+    )
+    service.prepare()
+    service.start_compaction()
+    return service
+
+
+def create_compaction_config(
+    interval: int = HISTORY_COMPACTION_INTERVAL,
+    overlap: int = HISTORY_COMPACTION_OVERLAP,
+    summary_model: Optional[str] = HISTORY_SUMMARY_MODEL,
+    enabled: bool = HISTORY_COMPACTION_ENABLED,
+) -> Optional["EventsCompactionConfig"]:
+    """Rolling summarization of older turns, or None when disabled.
+
+    After every ``interval`` new turns the runner replaces them (plus
+    ``overlap`` earlier turns, for continuity) with one model-written
+    summary, so the history sent with each prompt stops growing with the
+    conversation. The summary uses ``summary_model`` if set, otherwise the
+    root agent's model, and costs one model call per compaction. Off
+    unless ``enabled`` (``HISTORY_COMPACTION_ENABLED``); an interval of 0
+    also turns it off.
+    """
+    if not enabled or interval <= 0:
+        return None
+
+    from google.adk.apps.app import EventsCompactionConfig
+    from google.adk.apps.llm_event_summarizer import LlmEventSummarizer
+    from google.adk.models import Gemini
+
+    summarizer = None
+    if summary_model:
+        summarizer = LlmEventSummarizer(llm=Gemini(model=summary_model))
+
+    return EventsCompactionConfig(
+        compaction_interval=interval,
+        overlap_size=overlap,
+        summarizer=summarizer,
+    )
@@ -0,0 +1,171 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.plugins import BasePlugin
+from google.adk.tools import BaseTool, ToolContext
+from google.genai import types
+
+from agents.utils.tracing import Span, tracer
+
+# Open spans of runs that never finished (e.g. a cancelled stream) are
+# forgotten once this many runs are in flight.
+MAX_OPEN_RUNS = 1000
+
+
+class TracingPlugin(BasePlugin):
+    """Trace every run, agent, model call and tool call as nested spans.
+
+    Stages are ``run:<app>`` (one chat turn), ``agent:<name>``,
+    ``model:<agent>`` and ``tool:<name>``. A tool span is current while the
+    tool runs, so the agents of an AgentTool call and the spans opened
+    inside tools (image generation, saves) nest under it.
+    """
+
+    def __init__(self):
+        super().__init__(name="tracing")
+        self._lock = threading.Lock()
+        self._open: "OrderedDict[str, dict[tuple, Span]]" = OrderedDict()
+
+    async def before_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        # AgentTool runs are already covered by their tool span.
+        if tracer.in_tool():
+            return
+        self._start(invocation_context.invocation_id, ("run",), tracer.start_span(
+            f"run {invocation_context.app_name}",
+            stage=f"run:{invocation_context.app_name}",
+            **{
+                "session.id": invocation_context.session.id,
+                "user.id": invocation_context.user_id,
+            },
+        ))
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        self._end(invocation_context.invocation_id, ("run",))
+        with self._lock:
+            self._open.pop(invocation_context.invocation_id, None)
+
+    async def before_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> None:
+        self._start(callback_context.invocation_id, ("agent", agent.name), tracer.start_span(
+            f"agent {agent.name}", stage=f"agent:{agent.name}"
+        ))
+
+    async def after_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> None:
+        self._end(callback_context.invocation_id, ("agent", agent.name))
+        # A before_model_callback that answers (the fast router) skips the
+        # after_model callbacks, leaving a span for a call that never ran.
+        self._discard(callback_context.invocation_id, ("model", agent.name))
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> None:
+        key = ("model", callback_context.agent_name)
+        self._start(callback_context.invocation_id, key, tracer.start_span(
+            f"model {callback_context.agent_name}",
+            stage=f"model:{callback_context.agent_name}",
+            activate=False,
+            **{
+                "gen_ai.request.model": llm_request.model,
+                "request.bytes": sum(content_bytes(c) for c in llm_request.contents),
+            },
+        ))
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> None:
+        # Streamed partial chunks are followed by an aggregated response.
+        if llm_response.partial:
+            return
+        usage = llm_response.usage_metadata
+        self._end(
+            callback_context.invocation_id,
+            ("model", callback_context.agent_name),
+            **{
+                "gen_ai.usage.input_tokens": usage.prompt_token_count if usage else None,
+                "gen_ai.usage.output_tokens": usage.candidates_token_count if usage else None,
+                "response.bytes": content_bytes(llm_response.content),
+            },
+        )
+
+    async def on_model_error_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+    ) -> None:
+        self._end(
+            callback_context.invocation_id, ("model", callback_context.agent_name), error=error
+        )
+
+    async def before_tool_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext
+    ) -> None:
+        self._start(tool_context.invocation_id, ("tool", tool_context.function_call_id), tracer.start_span(
+            f"tool {tool.name}",
+            stage=f"tool:{tool.name}",
+            **{"request.bytes": json_bytes(tool_args)},
+        ))
+        tracer.enter_tool(tool_context.function_call_id)
+
+    async def after_tool_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext, result: Any
+    ) -> None:
+        tracer.exit_tool(tool_context.function_call_id)
+        self._end(
+            tool_context.invocation_id,
+            ("tool", tool_context.function_call_id),
+            **{"response.bytes": json_bytes(result)},
+        )
+
+    async def on_tool_error_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext, error: Exception
+    ) -> None:
+        tracer.exit_tool(tool_context.function_call_id)
+        self._end(tool_context.invocation_id, ("tool", tool_context.function_call_id), error=error)
+
+    def _start(self, invocation_id: str, key: tuple, span: Span):
+        with self._lock:
+            self._open.setdefault(invocation_id, {})[key] = span
+            while len(self._open) > MAX_OPEN_RUNS:
+                self._open.popitem(last=False)
+
+    def _end(
+        self, invocation_id: str, key: tuple, error: Optional[BaseException] = None, **attributes
+    ):
+        span = self._discard(invocation_id, key)
+        if span is not None:
+            tracer.end_span(span, error=error, **attributes)
+
+    def _discard(self, invocation_id: str, key: tuple) -> Optional[Span]:
+        with self._lock:
+            return self._open.get(invocation_id, {}).pop(key, None)
+
+
+def content_bytes(content: Optional[types.Content]) -> int:
+    """Text plus inline data carried by ``content``, in bytes."""
+    if content is None or not content.parts:
+        return 0
+    total = 0
+    for part in content.parts:
+        if part.text:
+            total += len(part.text.encode("utf-8"))
+        if part.inline_data and part.inline_data.data:
+            total += len(part.inline_data.data)
+        if part.function_call:
+            total += json_bytes(part.function_call.args)
+        if part.function_response:
+            total += json_bytes(part.function_response.response)
+    return total
+
+
+def json_bytes(value: Any) -> int:
+    return len(json.dumps(value, default=str).encode("utf-8")) if value else 0
+
+
+tracing = TracingPlugin()
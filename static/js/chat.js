@@ -6,6 +6,8 @@ const suggestedPrompts = document.getElementById('suggestedPrompts');
 let isTyping = false;
 let messageCount = 1;
 
+const ERROR_MESSAGE = 'We\'re experiencing technical difficulties at the moment. Please try again in a few moments.';
+
 const SVG_STARS = `
     <svg class="icon-stars" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
         <polygon points="12 2 15.09 8.26 22 9.27 17 14.14 18.18 21.02 12 17.77 5.82 21.02 7 14.14 2 9.27 8.91 8.26 12 2"/>
@@ -71,7 +73,7 @@ const Chat = {
         UI.showTypingIndicator();
 
         try {
-            const response = await fetch('/api/chat', {
+            const response = await fetch('/api/chat/stream', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
@@ -79,20 +81,11 @@ const Chat = {
                 body: JSON.stringify({ message }),
             });
 
-            const data = await response.json();
-
-            UI.hideTypingIndicator();
-
-            if (data.status === 'success') {
-                UI.addAssistantMessage(data.response);
-
-                if (data.images && data.images.length > 0) {
-                    UI.addImageMessage(data.images);
-                }
-            } else {
-                UI.addAssistantMessage(data.response || 'We\'re experiencing technical difficulties at the moment. Please try again in a few moments.');
-                console.error('Error from backend:', data);
+            if (!response.ok || !response.body) {
+                throw new Error(`Unexpected response status ${response.status}`);
             }
+
+            await this.consumeStream(response.body);
         } catch (error) {
             UI.hideTypingIndicator();
 
@@ -101,6 +94,96 @@ const Chat = {
         }
 
         UI.scrollToBottom();
+    },
+
+    async consumeStream(body) {
+        const reader = body.getReader();
+        const decoder = new TextDecoder();
+        const state = { messageDiv: null, author: null, text: '', shownImages: new Set(), finished: false };
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const frame = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                this.handleStreamEvent(Utils.parseSseFrame(frame), state);
+            }
+        }
+
+        UI.hideTypingIndicator();
+        if (!state.finished) {
+            // The connection closed before the server could report an outcome.
+            UI.addAssistantMessage(ERROR_MESSAGE);
+            console.error('Stream ended without a done or error event');
+        }
+    },
+
+    handleStreamEvent({ event, data }, state) {
+        if (!event || !data) return;
+
+        switch (event) {
+            case 'text':
+                UI.removeTypingIndicator();
+                if (state.messageDiv && data.author !== state.author) {
+                    // Another agent took over the answer: give it a bubble of its own.
+                    state.messageDiv = null;
+                    state.text = '';
+                }
+                state.author = data.author;
+                state.text += data.delta;
+                if (!state.messageDiv) {
+                    state.messageDiv = UI.addAssistantMessage(state.text);
+                } else {
+                    UI.updateAssistantMessage(state.messageDiv, state.text);
+                }
+                break;
+
+            case 'tool_start':
+                UI.setStreamStatus(`Working with ${data.name.replace(/_/g, ' ')}...`);
+                break;
+
+            case 'tool_end':
+                UI.setStreamStatus('');
+                break;
+
+            case 'images':
+                this.showNewImages(data.images, state);
+                break;
+
+            case 'done':
+                state.finished = true;
+                UI.hideTypingIndicator();
+                // Streamed bubbles already hold each agent's own text; the
+                // final response only stands in when nothing was streamed.
+                if (!state.messageDiv) {
+                    state.messageDiv = UI.addAssistantMessage(data.response);
+                } else if (!state.text.trim()) {
+                    UI.updateAssistantMessage(state.messageDiv, data.response);
+                }
+                this.showNewImages(data.images || [], state);
+                break;
+
+            case 'error':
+                state.finished = true;
+                UI.hideTypingIndicator();
+                UI.addAssistantMessage(data.response || ERROR_MESSAGE);
+                console.error('Error from backend:', data);
+                break;
+        }
+    },
+
+    showNewImages(images, state) {
+        const newImages = images.filter(({ latest }) => !state.shownImages.has(latest));
+        if (newImages.length === 0) return;
+
+        newImages.forEach(({ latest }) => state.shownImages.add(latest));
+        UI.addImageMessage(newImages);
     }
 };
 
@@ -149,7 +232,18 @@ const UI = {
                 <p>${Utils.formatMessage(text)}</p>
             </div>
         `;
-        messagesArea.appendChild(messageDiv);
+        this.appendMessage(messageDiv);
+        this.scrollToBottom();
+        return messageDiv;
+    },
+
+    appendMessage(messageDiv) {
+        // The status line stays below the newest message.
+        messagesArea.insertBefore(messageDiv, document.getElementById('streamStatus'));
+    },
+
+    updateAssistantMessage(messageDiv, text) {
+        messageDiv.querySelector('.message-content p').innerHTML = Utils.formatMessage(text);
         this.scrollToBottom();
     },
 
@@ -166,7 +260,9 @@ const UI = {
                 <div class="image-container" style="margin-top: 1rem;">
                     <p style="font-weight: 600; margin-bottom: 0.5rem; color: #3d2e23;">${Utils.escapeHtml(name)}</p>
                     <div class="image-wrapper">
-                        <img src="${latest}" alt="${Utils.escapeHtml(name)}" />
+                        <a href="${latest}" target="_blank" rel="noopener">
+                            <img src="${latest}?size=preview" alt="${Utils.escapeHtml(name)}" loading="lazy" />
+                        </a>
                         <a href="${latest}" download="${fileName}" class="download-button" title="Download image">
                             ${SVG_DOWNLOAD}
                         </a>
@@ -188,7 +284,7 @@ const UI = {
                 ${imagesHtml}
             </div>
         `;
-        messagesArea.appendChild(messageDiv);
+        this.appendMessage(messageDiv);
         this.scrollToBottom();
     },
 
@@ -216,13 +312,37 @@ const UI = {
     hideTypingIndicator() {
         isTyping = false;
         Input.handleChange();
+        this.removeTypingIndicator();
+        this.setStreamStatus('');
+    },
 
+    removeTypingIndicator() {
         const typingIndicator = document.getElementById('typingIndicator');
         if (typingIndicator) {
             typingIndicator.remove();
         }
     },
 
+    setStreamStatus(text) {
+        // Separate from the typing indicator, which goes once text streams in.
+        let status = document.getElementById('streamStatus');
+        if (!text) {
+            if (status) {
+                status.remove();
+            }
+            return;
+        }
+
+        if (!status) {
+            status = document.createElement('div');
+            status.id = 'streamStatus';
+            status.className = 'stream-status';
+            messagesArea.appendChild(status);
+        }
+        status.textContent = text;
+        this.scrollToBottom();
+    },
+
     scrollToBottom() {
         messagesArea.scrollTop = messagesArea.scrollHeight;
     },
@@ -263,5 +383,29 @@ const Utils = {
         });
 
         return text;
+    },
+
+    parseSseFrame(frame) {
+        let event = null;
+        const dataLines = [];
+
+        frame.split('\n').forEach(line => {
+            if (line.startsWith('event:')) {
+                event = line.slice(6).trim();
+            } else if (line.startsWith('data:')) {
+                dataLines.push(line.slice(5).trim());
+            }
+        });
+
+        if (dataLines.length === 0) {
+            return { event, data: null };
+        }
+
+        try {
+            return { event, data: JSON.parse(dataLines.join('\n')) };
+        } catch (error) {
+            console.error('Malformed stream event:', frame);
+            return { event, data: null };
+        }
     }
 };